@@ -4,6 +4,9 @@
 BASE_URL = "https://www.red-dot.org/de/search/search.json"
 SITE_BASE_URL = "https://www.red-dot.org"
 
+# 搜索 API 每页返回的作品数 (solr[resultsPerPage])，None 表示使用网站默认值
+API_RESULTS_PER_PAGE = None
+
 # 输出目录配置
 OUTPUT_DIR = "output"
 
@@ -16,8 +19,12 @@ CATEGORIES = {
 
 # 其他配置
 MAX_RETRIES = 3
-RETRY_DELAY = 1 # 秒
+RETRY_DELAY = 1 # 秒，重试的指数退避系数
 REQUEST_TIMEOUT = 10 # 秒
+MAX_IMAGE_BYTES = 50 * 1024 * 1024 # 单张图片的大小上限（字节），超过时跳过下载
+IMAGE_REVALIDATE = False # 已下载的图片是否向服务器发送条件请求确认未变化，False 时直接复用本地文件
+DETAILS_CACHE_DAYS = 30 # 详情页解析结果（描述、作者）在分类目录 details_cache 中的缓存天数，设为 0 关闭
+HTTP_CACHE_EXPIRE = 86400 # 秒，安装 requests-cache 时 HTTP 响应缓存的有效期，设为 0 关闭缓存
 
 # 字体配置
 FONTS_DIR = "fonts"
@@ -27,4 +34,9 @@ import logging
 LOGGING_LEVEL = logging.INFO # 默认日志级别为 INFO
 
 # 多线程配置
-NUM_THREADS = 10 # 并发线程数，可根据网络条件和机器性能调整 
\ No newline at end of file
+NUM_THREADS = 10 # 并发线程数，可根据网络条件和机器性能调整
+
+# PDF 生成配置
+PDF_PAGE_SIZE = 20 # 每个数据页收录的作品数
+PDF_WORKERS = None # generate_full_pdf_parallel 并行生成临时页 PDF 的进程数，None 表示使用 CPU 核心数
+KEEP_TEMP = False # 调试用：合并后保留临时 PDF 文件（移动到输出目录）并跳过清理临时目录
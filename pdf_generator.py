@@ -1,21 +1,57 @@
 import os
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import platform
-from io import BytesIO
+import multiprocessing
+import concurrent.futures
+import hashlib
+import mimetypes
+import json
+import contextlib
+import shutil
+import subprocess
+import functools
+import struct
+
+import urllib3
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import BaseDocTemplate, PageTemplate, NextPageTemplate, Frame, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch, cm
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.enums import TA_CENTER, TA_LEFT # 导入对齐常量
 from PIL import Image as PILImage
-from PyPDF2 import PdfReader, PdfWriter
+from xml.sax.saxutils import escape
+# pypdf 是 PyPDF2 的后续维护版本，合并更快；未安装时使用 PyPDF2
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    from PyPDF2 import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
+from reportlab import rl_config
+
+# pikepdf 基于 qpdf (C++)，合并速度远快于 PyPDF2；未安装时回退到 PyPDF2
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+# platformdirs 提供各平台规范的缓存目录；未安装时使用 XDG 缓存目录
+try:
+    from platformdirs import user_cache_dir
+except ImportError:
+    user_cache_dir = None
+
+# qpdf 命令行可流式拼接 PDF，内存占用与输出大小无关，优先使用
+QPDF_BIN = shutil.which('qpdf')
+
+# 内容流使用 Flate 压缩；二进制流不再做 ASCII85 编码，避免约 25% 的体积和编码开销
+rl_config.pageCompression = 1
+rl_config.useA85 = 0
 
 # 导入配置
 import config
@@ -23,31 +59,43 @@ import config
 # 配置日志 (在 PdfGenerator 中也需要日志)
 logger = logging.getLogger(__name__)
 
-# 根据操作系统选择合适的中文字体
+# 支持的字体文件扩展名
+_FONT_EXTS = ('.ttf', '.ttc', '.otf')
+
+# 探测时已解析的字体对象，选中后直接注册，不再重复解析字体文件
+_probed_fonts: Dict[str, TTFont] = {}
+
+# 根据操作系统选择合适的中文字体，结果在进程内缓存
+@functools.lru_cache(maxsize=1)
 def get_system_font():
     def is_valid_font(font_path):
         try:
             try:
-                pdfmetrics.registerFont(TTFont('TestFont', font_path))
+                # 只解析字体文件，不注册到全局字体表；只保留最近一个解析结果
+                font = TTFont('SystemFont', font_path)
+                _probed_fonts.clear()
+                _probed_fonts[font_path] = font
                 return True
             except Exception as e:
-                logger.debug(f"字体文件 {font_path} 注册测试失败: {str(e)}")
+                logger.debug("字体文件 %s 注册测试失败: %s", font_path, e)
                 return False
         except Exception as e:
-            logger.warning(f"检查字体文件 {font_path} 时出错: {str(e)}")
+            logger.warning("检查字体文件 %s 时出错: %s", font_path, e)
             return False
 
     # 首先检查fonts目录下的字体
     fonts_dir = config.FONTS_DIR # 使用 config 中配置的字体目录
     if os.path.exists(fonts_dir):
-        for font_file in os.listdir(fonts_dir):
-            if font_file.endswith(('.ttf', '.ttc', '.otf')):
-                font_path = os.path.join(fonts_dir, font_file)
+        with os.scandir(fonts_dir) as entries:
+            for entry in entries:
+                if not (entry.is_file() and entry.name.endswith(_FONT_EXTS)):
+                    continue
+                font_path = entry.path
                 if is_valid_font(font_path):
-                    logger.info(f"找到有效的自定义字体: {font_path}")
+                    logger.info("找到有效的自定义字体: %s", font_path)
                     return font_path
                 else:
-                    logger.warning(f"字体文件格式无效: {font_path}")
+                    logger.warning("字体文件格式无效: %s", font_path)
     
     # 如果fonts目录下没有有效字体，则使用系统字体
     system = platform.system()
@@ -61,67 +109,257 @@ def get_system_font():
         ]
         for path in font_paths:
             if os.path.exists(path) and is_valid_font(path):
-                logger.info(f"使用有效的系统字体: {path}")
+                logger.info("使用有效的系统字体: %s", path)
                 return path
             elif os.path.exists(path):
-                logger.warning(f"系统字体格式无效: {path}")
+                logger.warning("系统字体格式无效: %s", path)
     elif system == 'Windows':
         font_path = 'C:\\Windows\\Fonts\\msyh.ttc'
         if os.path.exists(font_path) and is_valid_font(font_path):
-            logger.info(f"使用有效的系统字体: {font_path}")
+            logger.info("使用有效的系统字体: %s", font_path)
             return font_path
         elif os.path.exists(font_path):
-            logger.warning(f"系统字体格式无效: {font_path}")
+            logger.warning("系统字体格式无效: %s", font_path)
     else:  # Linux
         font_path = '/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf'
         if os.path.exists(font_path) and is_valid_font(font_path):
-            logger.info(f"使用有效的系统字体: {path}")
+            logger.info("使用有效的系统字体: %s", font_path)
             return font_path
         elif os.path.exists(font_path):
-            logger.warning(f"系统字体格式无效: {path}")
+            logger.warning("系统字体格式无效: %s", font_path)
     
     logger.warning("未找到任何有效的中文字体")
     return None
 
-# 注册系统字体
-FONT_PATH = get_system_font()
+def _cache_dir() -> str:
+    """本工具的用户缓存目录"""
+    if user_cache_dir is not None:
+        return user_cache_dir('reddot')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'reddot')
+
+# 字体选择结果缓存文件，避免每次启动（包括每个工作进程）都重新扫描和解析字体
+FONT_CACHE_FILE = os.path.join(_cache_dir(), 'font.json')
+
+def _font_cache_key() -> Dict:
+    """字体目录的当前状态，目录内容变化时缓存失效"""
+    fonts_dir = os.path.abspath(config.FONTS_DIR)
+    return {
+        'fonts_dir': fonts_dir,
+        'fonts_dir_mtime': os.path.getmtime(fonts_dir) if os.path.exists(fonts_dir) else None
+    }
+
+def load_cached_font() -> Optional[str]:
+    """读取缓存的字体路径，字体文件和字体目录均未变化时才返回"""
+    try:
+        with open(FONT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('key') == _font_cache_key() and os.path.getmtime(cached['path']) == cached['mtime']:
+            return cached['path']
+    except Exception:
+        pass
+    return None
+
+def save_cached_font(font_path: str):
+    """缓存字体路径及其修改时间"""
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, 'w', encoding='utf-8') as f:
+            # 保存绝对路径，从其他工作目录启动时缓存仍然有效
+            json.dump({'path': os.path.abspath(font_path), 'mtime': os.path.getmtime(font_path), 'key': _font_cache_key()}, f)
+    except Exception as e:
+        logger.debug("写入字体缓存失败: %s", e)
+
+# 注册系统字体，优先使用缓存的字体路径
+FONT_PATH = load_cached_font()
+if FONT_PATH:
+    logger.debug("使用缓存的字体: %s", FONT_PATH)
+else:
+    FONT_PATH = get_system_font()
+    if FONT_PATH:
+        save_cached_font(FONT_PATH)
 try:
-    if FONT_PATH and os.path.exists(FONT_PATH):
+    # 缓存命中时 load_cached_font 已核对过文件修改时间，探测到的字体也已确认存在，无需再检查路径
+    if FONT_PATH:
         try:
-            pdfmetrics.registerFont(TTFont('SystemFont', FONT_PATH))
+            # 已注册过（例如模块被重新加载）时不再重复解析字体文件
+            if 'SystemFont' not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(_probed_fonts.pop(FONT_PATH, None) or TTFont('SystemFont', FONT_PATH))
             FONT_NAME = 'SystemFont'
-            logger.info(f"成功加载字体: {FONT_PATH}")
+            logger.info("成功加载字体: %s", FONT_PATH)
         except Exception as e:
-            logger.error(f"注册字体失败: {str(e)}")
+            logger.error("注册字体失败: %s", e)
             raise
     else:
         raise Exception("未找到可用的字体")
 except Exception as e:
-    logger.warning(f"无法加载字体: {str(e)}，将使用默认字体")
+    logger.warning("无法加载字体: %s，将使用默认字体", e)
     FONT_NAME = 'Helvetica'
 
+# 嵌入 PDF 的图片目标分辨率和重新编码的 JPEG 质量
+IMAGE_DPI = 150
+IMAGE_JPEG_QUALITY = 80
+
+# JPEG 中携带图像尺寸的 SOF 段标记
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def _fast_image_size(path: str) -> Tuple[int, int]:
+    """只解析文件头获取图片尺寸 (宽, 高)：JPEG 读取 SOF 段，PNG 读取 IHDR，其他格式回退到 Pillow
+
+    结果按 (路径, 修改时间, 大小) 缓存：同一张图片出现在多个作品或数据页中时只读取一次文件头，
+    文件被原地覆盖后重新读取
+    """
+    stat = os.stat(path)
+    return _cached_image_size(path, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=8192)
+def _cached_image_size(path: str, mtime_ns: int, size: int) -> Tuple[int, int]:
+    """_fast_image_size 的缓存实现，mtime_ns 和 size 只用作缓存键"""
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                code = marker[1]
+                # 跳过填充字节和不带长度的独立标记
+                if code == 0xFF:
+                    f.seek(-1, 1)
+                    continue
+                if code == 0x01 or 0xD0 <= code <= 0xD8:
+                    continue
+                segment = f.read(2)
+                if len(segment) < 2:
+                    break
+                length = struct.unpack('>H', segment)[0]
+                if code in _JPEG_SOF_MARKERS:
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(length - 2, 1)
+
+    with PILImage.open(path) as img:
+        return img.size
+
+@functools.lru_cache(maxsize=1)
+def _base_styles() -> StyleSheet1:
+    """ReportLab 示例样式表，每个进程只构造一次，调用方不得修改"""
+    return getSampleStyleSheet()
+
+def _copy_style_sheet(base: StyleSheet1) -> StyleSheet1:
+    """浅拷贝样式表：共享已有的样式对象，新增样式不影响原样式表"""
+    sheet = StyleSheet1()
+    sheet.byName.update(base.byName)
+    sheet.byAlias.update(base.byAlias)
+    return sheet
+
+# 页脚文本、字号及其预先测量的宽度（文本固定，只需测量一次）
+FOOTER_TEXT = "红点设计奖作品集 tAngo/org.java.tango@gmail.com"
+FOOTER_FONT_SIZE = 8
+FOOTER_WIDTH = pdfmetrics.stringWidth(FOOTER_TEXT, FONT_NAME, FOOTER_FONT_SIZE)
+
+PAGE_NUMBER_FONT_SIZE = 9
+
+@functools.lru_cache(maxsize=16)
+def _page_number_width(page_digits: int, total_digits: int) -> float:
+    """页码文字宽度只取决于页码和总页数的位数（数字字形等宽），按位数缓存，不必每页测量"""
+    return pdfmetrics.stringWidth(f"第 {'0' * page_digits} 页 / 共 {'0' * total_digits} 页", FONT_NAME, PAGE_NUMBER_FONT_SIZE)
+
+# 封面和内容页的页边距
+COVER_MARGINS = {'leftMargin': 2*cm, 'rightMargin': 2*cm, 'topMargin': 5*cm, 'bottomMargin': 2*cm}
+BODY_MARGINS = {'leftMargin': 2*cm, 'rightMargin': 2*cm, 'topMargin': 3*cm, 'bottomMargin': 3*cm} # 上下留出页眉页脚空间
+
+def _margin_frame(margins: Dict) -> Frame:
+    """按页边距创建铺满 A4 可用区域的 Frame"""
+    width, height = A4
+    return Frame(
+        margins['leftMargin'], margins['bottomMargin'],
+        width - margins['leftMargin'] - margins['rightMargin'],
+        height - margins['topMargin'] - margins['bottomMargin'],
+        id='normal'
+    )
+
+def _draw_page_number(canv: canvas.Canvas, page_number: int, total_pages: int):
+    """在页面右下角绘制 "第 X 页 / 共 Y 页"，距离右边缘和底边缘 1.5cm"""
+    width, height = A4
+    margin = 1.5 * cm
+    canv.saveState()
+    canv.setFont(FONT_NAME, PAGE_NUMBER_FONT_SIZE)
+    canv.setFillColor(colors.grey)
+    # 右对齐：用缓存的宽度计算起点，代替 drawRightString 每页测量文字宽度
+    text_width = _page_number_width(len(str(page_number)), len(str(total_pages)))
+    canv.drawString(width - margin - text_width, margin, f"第 {page_number} 页 / 共 {total_pages} 页")
+    canv.restoreState()
+
+def _create_page_number_overlay(output_path: str, total_pages: int):
+    """生成只包含页码的 total_pages 页 PDF，合并时逐页叠加到作品集上；所有页在同一画布上绘制，字体只嵌入一次"""
+    overlay = canvas.Canvas(output_path, pagesize=A4, pageCompression=1, invariant=1)
+    for page_number in range(1, total_pages + 1):
+        _draw_page_number(overlay, page_number, total_pages)
+        overlay.showPage()
+    overlay.save()
+
+class NumberedCanvas(canvas.Canvas):
+    """在生成时绘制 "第 X 页 / 共 Y 页" 页码的画布：先暂存每页状态，保存时已知总页数再统一绘制"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._saved_page_states = []
+
+    def showPage(self):
+        self._saved_page_states.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        total_pages = len(self._saved_page_states)
+        for state in self._saved_page_states:
+            self.__dict__.update(state)
+            _draw_page_number(self, self._pageNumber, total_pages)
+            super().showPage()
+        super().save()
+
 class PdfGenerator:
+    # 所有实例共享的样式表，首次创建实例时构建
+    _STYLES: Optional[StyleSheet1] = None
+
     def __init__(self, output_dir: str = config.OUTPUT_DIR):
         self.output_dir = output_dir
         self.temp_dir = os.path.join(self.output_dir, "temp")
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
-        logger.info(f"PDF 生成器初始化，输出目录: {self.output_dir}")
+        # 图片缓存目录，跨运行保留，按 URL 哈希命名
+        self.image_cache_dir = os.path.join(self.output_dir, ".imgcache")
+        # 所需目录只在初始化时创建一次，之后的方法直接使用
+        for directory in (self.output_dir, self.temp_dir, self.image_cache_dir):
+            os.makedirs(directory, exist_ok=True)
+        logger.info("PDF 生成器初始化，输出目录: %s", self.output_dir)
         self.FONT_NAME = FONT_NAME # 使用模块级别的字体名称
 
         # 设置 chinese_font 为全局确定的字体名称
         self.chinese_font = FONT_NAME
 
-        # 创建样式
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
+        # 按图片内容去重的缓存：内容摘要 -> 首次出现的图片路径，以及图片路径 -> 去重后的路径
+        self._image_cache: Dict[bytes, str] = {}
+        self._image_paths: Dict[str, str] = {}
+        # 图片缩放结果缓存：(原图路径, 原图修改时间, 目标像素) -> 缩放后的图片路径
+        self._prepared_images: Dict[Tuple[str, int, int], str] = {}
+
+        # 共享的连接池，复用连接下载图片，失败自动重试
+        self._http = urllib3.PoolManager(maxsize=32, retries=urllib3.Retry(total=config.MAX_RETRIES, backoff_factor=config.RETRY_DELAY))
+
+        # 样式只依赖模块级字体，构建一次后所有实例共用
+        if PdfGenerator._STYLES is None:
+            PdfGenerator._STYLES = self._build_styles()
+        self.styles = PdfGenerator._STYLES
+
+    def _build_styles(self) -> StyleSheet1:
+        """构建 PDF 样式：在共享的示例样式表基础上浅拷贝，再添加中文样式"""
+        styles = _copy_style_sheet(_base_styles())
 
-    def _setup_styles(self):
-        """设置 PDF 样式"""
         # 标题样式
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ChineseTitle',
             fontName=self.chinese_font,
             fontSize=24,
@@ -131,7 +369,7 @@ class PdfGenerator:
         ))
 
         # 子标题样式
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ChineseSubTitle',
             fontName=self.chinese_font,
             fontSize=16,
@@ -141,7 +379,7 @@ class PdfGenerator:
         ))
 
         # 正文样式
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ChineseBody',
             fontName=self.chinese_font,
             fontSize=12,
@@ -151,7 +389,7 @@ class PdfGenerator:
         ))
 
         # 标签样式
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ChineseLabel',
             fontName=self.chinese_font,
             fontSize=12,
@@ -161,477 +399,476 @@ class PdfGenerator:
             leading=14
         ))
 
-    def create_temp_page_pdf(self, designs: List[Dict], page_num: int) -> Optional[str]:
-        """生成包含单页数据和临时封面/页眉页脚的PDF文件"""
-        logger.info(f"开始生成第 {page_num} 页的临时PDF")
-        
-        output_filename = f"temp_page_{page_num}.pdf"
-        output_path = os.path.join(self.temp_dir, output_filename)
-
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=3*cm,  # 增加顶部边距，为页眉留出空间
-            bottomMargin=3*cm  # 增加底部边距，为页脚留出空间
-        )
-
-        styles = getSampleStyleSheet()
-
-        # 临时页封面/页眉样式
-        temp_cover_style = ParagraphStyle(
-            'TempCover',
-            parent=styles['Heading1'],
-            fontName=self.FONT_NAME,
-            fontSize=18,
-            spaceAfter=20,
-            alignment=1,  # 居中
-            textColor=colors.HexColor('#1a1a1a')
-        )
-        
         # 临时页标题样式 (参考最终封面标题)
-        temp_page_title_style = ParagraphStyle(
-            'TempPageTitle',
+        styles.add(ParagraphStyle(
+            name='TempPageTitle',
             parent=styles['Heading1'],
-            fontName=self.FONT_NAME,
+            fontName=self.chinese_font,
             fontSize=24, # 适当增大字体
             spaceBefore=10*cm, # 增加顶部空间模拟垂直居中
             spaceAfter=0.5*cm, # 调整间距，减小主标题与下方信息的距离
             alignment=1,  # 居中
             textColor=colors.HexColor('#1a1a1a'),
             bold=1 # 加粗
-        )
-        
+        ))
+
         # 临时页信息样式 (参考最终封面副标题/信息)
-        temp_page_info_style = ParagraphStyle(
-            'TempPageInfo',
+        styles.add(ParagraphStyle(
+            name='TempPageInfo',
             parent=styles['Normal'],
-            fontName=self.FONT_NAME,
+            fontName=self.chinese_font,
             fontSize=12,  # 调整字体大小
             spaceAfter=0.5*cm, # 调整间距
             alignment=1, # 居中
             textColor=colors.HexColor('#444444')
+        ))
+
+        # 临时页时间信息样式
+        styles.add(ParagraphStyle(
+            name='TempTimeAuthorInfo',
+            parent=styles['TempPageInfo'],
+            spaceAfter=0.2*cm # 调整时间和作者之间的间距
+        ))
+
+        # 作品详情样式（标签黑色、内容灰色，段落后留出作品之间的间隔）
+        styles.add(ParagraphStyle(
+            name='DesignInfo',
+            parent=styles['Normal'],
+            fontName=self.chinese_font,
+            fontSize=10,
+            textColor=colors.HexColor('#666666'),
+            leading=16,
+            spaceAfter=20
+        ))
+
+        # 封面主标题样式
+        styles.add(ParagraphStyle(
+            name='CoverTitle',
+            parent=styles['Heading1'],
+            fontName=self.chinese_font,
+            fontSize=36,
+            spaceAfter=40,
+            alignment=1,
+            textColor=colors.HexColor('#1a1a1a'),
+            bold=1,
+            spaceBefore=8*cm # 增加顶部空间，帮助垂直居中
+        ))
+
+        # 封面信息样式
+        styles.add(ParagraphStyle(
+            name='CoverInfo',
+            parent=styles['Normal'],
+            fontName=self.chinese_font,
+            fontSize=14,
+            spaceAfter=15,
+            alignment=1,
+            textColor=colors.HexColor('#444444')
+        ))
+
+        # 封面时间和作者样式
+        styles.add(ParagraphStyle(
+            name='CoverTimeAuthorInfo',
+            parent=styles['Normal'],
+            fontName=self.chinese_font,
+            fontSize=10,
+            spaceAfter=0,
+            alignment=1,
+            textColor=colors.HexColor('#666666')
+        ))
+
+        # 封面时间信息样式，调整时间和作者之间的间距
+        styles.add(ParagraphStyle(
+            name='CoverTimeInfo',
+            parent=styles['CoverTimeAuthorInfo'],
+            spaceAfter=0.2*cm
+        ))
+
+        return styles
+
+    def _create_doc(self, output_path: str, page_templates: List[PageTemplate]) -> BaseDocTemplate:
+        """创建使用指定页面模板的 A4 文档，第一个模板用于首页，页脚由模板的 onPage 回调在生成时绘制"""
+        # invariant 固定文档时间戳和 ID，相同输入生成相同的文件
+        return BaseDocTemplate(
+            output_path, pagesize=A4, pageTemplates=page_templates,
+            pageCompression=1, invariant=1, **BODY_MARGINS
         )
 
+    def _cover_template(self) -> PageTemplate:
+        """封面页面模板"""
+        return PageTemplate(id='cover', frames=[_margin_frame(COVER_MARGINS)], onPage=self._draw_cover_footer)
+
+    def _body_template(self) -> PageTemplate:
+        """内容页页面模板"""
+        return PageTemplate(id='body', frames=[_margin_frame(BODY_MARGINS)], onPage=self._draw_footer)
+
+    def _draw_footer(self, canvas, doc):
+        """内容页页脚：左下角绘制作品集名称和作者信息，页码由 NumberedCanvas 绘制在右下角"""
+        # 页脚内容每页相同，首次绘制为表单对象，之后各页只引用该对象
+        if not canvas.hasForm('footer'):
+            canvas.beginForm('footer')
+            canvas.setFont(self.FONT_NAME, FOOTER_FONT_SIZE)
+            canvas.setFillColor(colors.grey)
+            canvas.drawString(doc.leftMargin, 1.5 * cm, FOOTER_TEXT)
+            canvas.endForm()
+        canvas.doForm('footer')
+
+    def _draw_cover_footer(self, canvas, doc):
+        """封面页脚：底部居中绘制作品集名称和作者信息"""
+        canvas.saveState()
+        canvas.setFont(self.FONT_NAME, FOOTER_FONT_SIZE)
+        canvas.setFillColor(colors.grey)
+        canvas.drawString((A4[0] - FOOTER_WIDTH) / 2, 1.5 * cm, FOOTER_TEXT)
+        canvas.restoreState()
+
+    def create_temp_page_pdf(self, designs: List[Dict], page_num: int, number_pages: bool = True) -> Optional[str]:
+        """生成包含单页数据和临时封面/页眉页脚的PDF文件
+
+        number_pages 为 False 时不绘制页码，由合并时叠加全局页码
+        """
+        logger.info("开始生成第 %d 页的临时PDF", page_num)
+        
+        # 上一次合并后临时目录已被清理，同一实例再次生成时需重新创建
+        os.makedirs(self.temp_dir, exist_ok=True)
+        output_filename = f"temp_page_{page_num}.pdf"
+        output_path = os.path.join(self.temp_dir, output_filename)
+
+        doc = self._create_doc(output_path, [self._body_template()])
+        story = self._page_story(designs, page_num)
+
+        try:
+            # 生成临时PDF，页码在生成时直接绘制
+            doc.build(story, canvasmaker=NumberedCanvas if number_pages else canvas.Canvas)
+            logger.info("第 %d 页临时PDF文件生成成功: %s", page_num, output_path)
+            return output_path
+        except Exception as e:
+            logger.error("生成第 %d 页临时PDF时出错: %s", page_num, e)
+            return None
+
+    def _page_story(self, designs: List[Dict], page_num: int,
+                    local_images: Optional[Dict[str, Optional[str]]] = None) -> List:
+        """生成单个数据页的内容：数据页说明页，以及每个作品的图片和详细信息
+
+        local_images 为已预下载的 URL 到本地文件的映射，未提供时下载本页图片
+        """
         story = []
 
         # 添加临时页标题 - 使用原页眉文本作为主标题
-        story.append(Paragraph(f"红点设计奖作品集 (数据页 {page_num})", temp_page_title_style))
+        story.append(Paragraph(f"红点设计奖作品集 (数据页 {page_num})", self.styles['TempPageTitle']))
         
         # 添加本页收录作品数量信息 (移到时间上方)
-        story.append(Paragraph(f"本页收录 {len(designs)} 个作品", temp_page_info_style))
+        story.append(Paragraph(f"本页收录 {len(designs)} 个作品", self.styles['TempPageInfo']))
         story.append(Spacer(1, 0.5*cm)) # 调整作品数与时间之间的间距
 
         # 添加临时页信息 (时间、作者)
-        temp_time_author_style = ParagraphStyle(
-            'TempTimeAuthorInfo',
-            parent=temp_page_info_style,
-            spaceAfter=0.2*cm # 调整时间和作者之间的间距
-        )
-        story.append(Paragraph(f"生成时间：{datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}", temp_time_author_style))
-        story.append(Paragraph(f"tAngo/org.java.tango@gmail.com", temp_page_info_style))
+        story.append(Paragraph(f"生成时间：{datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}", self.styles['TempTimeAuthorInfo']))
+        story.append(Paragraph(f"tAngo/org.java.tango@gmail.com", self.styles['TempPageInfo']))
         
         story.append(Spacer(1, 3*cm)) # 调整信息与内容之间的间距
 
         story.append(PageBreak()) # 强制分页，后续是作品内容
 
+        # 并行预下载本页所有远程图片，排版循环只读取本地文件
+        if local_images is None:
+            local_images = self._prefetch_images(designs)
+
         # 添加当前页的设计作品
         for i, design in enumerate(designs, 1): # 序号相对于当前页
             try:
-                logger.info(f"处理第 {page_num} 页的第 {i} 个作品: {design.get('title', '未知标题')}")
+                logger.debug("处理第 %d 页的第 %d 个作品: %s", page_num, i, design.get('title', '未知标题'))
 
                 # 处理图片
                 image_path = design.get('image_path')
                 if image_path:
                     try:
-                        # 如果是URL，先下载图片
+                        # 如果是URL，使用预先并行下载好的本地文件
                         if image_path.startswith('http'):
-                            import requests
-                            from urllib.parse import urlparse
-                            from pathlib import Path
-                            
-                            # 创建临时图片目录
-                            temp_img_dir = os.path.join(self.temp_dir, 'images')
-                            if not os.path.exists(temp_img_dir):
-                                os.makedirs(temp_img_dir)
-                            
-                            # 从URL中提取文件名
-                            parsed_url = urlparse(image_path)
-                            filename = os.path.basename(parsed_url.path)
-                            if not filename:
-                                filename = f"image_{page_num}_{i}.jpg"
-                            
-                            # 下载图片
-                            response = requests.get(image_path)
-                            if response.status_code == 200:
-                                temp_img_path = os.path.join(temp_img_dir, filename)
-                                with open(temp_img_path, 'wb') as f:
-                                    f.write(response.content)
-                                image_path = temp_img_path
-                                logger.info(f"图片下载成功: {image_path}")
-                            else:
-                                logger.warning(f"图片下载失败，状态码: {response.status_code}")
-                                image_path = None
-                        
+                            image_path = local_images.get(image_path)
+
                         # 如果图片路径有效，添加到PDF
                         if image_path and os.path.exists(image_path):
                             try:
-                                img = Image(image_path)
-                                # 调整图片大小以适应页面
-                                img_width, img_height = img.drawWidth, img.drawHeight
-                                aspect = img_height / float(img_width)
-                                # 限制图片宽度，高度按比例缩放
-                                max_img_width = A4[0] - doc.leftMargin - doc.rightMargin - 20 # 留出一些边距
-                                if img_width > max_img_width:
-                                    img_width = max_img_width
-                                    img_height = img_width * aspect
-
-                                # 确保图片高度不会超出页面可用高度（考虑边距）
-                                max_allowed_height = A4[1] - doc.topMargin - doc.bottomMargin - 20 # 留出更多余量
-                                if img_height > max_allowed_height:
-                                     img_height = max_allowed_height
-                                     img_width = img_height / aspect
-
-                                story.append(Image(image_path, width=img_width, height=img_height))
+                                # 限制图片宽度和高度（考虑边距）
+                                max_img_width = A4[0] - BODY_MARGINS['leftMargin'] - BODY_MARGINS['rightMargin'] - 20 # 留出一些边距
+                                max_allowed_height = A4[1] - BODY_MARGINS['topMargin'] - BODY_MARGINS['bottomMargin'] - 20 # 留出更多余量
+
+                                # 先按页面可用尺寸缩小并转为 JPEG，避免嵌入原始大图
+                                max_px = int(max(max_img_width, max_allowed_height) / 72 * IMAGE_DPI)
+                                image_path = self._prepare_image(image_path, max_px)
+                                # 内容相同的图片共用同一路径，ReportLab 按路径只嵌入一次
+                                image_path = self._dedup_image(image_path)
+
+                                # 只读取文件头获取尺寸，调整图片大小以适应页面
+                                img_width, img_height = _fast_image_size(image_path)
+                                # 按比例缩小到同时满足宽度和高度限制，不放大
+                                scale = min(1.0, max_img_width / img_width, max_allowed_height / img_height)
+                                img_width, img_height = img_width * scale, img_height * scale
+
+                                # lazy=2：绘制时才打开图片，绘制后立即释放，不在整个文档生成期间驻留解码数据
+                                story.append(Image(image_path, width=img_width, height=img_height, lazy=2))
                                 story.append(Spacer(1, 12)) # 图片下方间距
-                                logger.info(f"成功加载图片 {image_path} 并添加到PDF story")
+                                logger.debug("成功加载图片 %s 并添加到PDF story", image_path)
                             except Exception as e:
-                                logger.error(f"处理图片时出错: {str(e)}", exc_info=True)
-                                story.append(Paragraph("图片加载或处理失败", styles['Normal']))
+                                logger.error("处理图片时出错: %s", e, exc_info=True)
+                                story.append(Paragraph("图片加载或处理失败", self.styles['Normal']))
                                 story.append(Spacer(1, 12))
                         else:
-                            logger.warning(f"图片路径无效或文件不存在: {image_path}")
+                            logger.warning("图片路径无效或文件不存在: %s", image_path)
                     except Exception as e:
-                        logger.error(f"处理图片URL时出错: {str(e)}", exc_info=True)
+                        logger.error("处理图片URL时出错: %s", e, exc_info=True)
                 else:
-                    logger.warning(f"作品 {design.get('title', '未知标题')} 没有图片路径")
-
-                # 添加详细信息（不使用表格）
-                content_label_style = ParagraphStyle(
-                    'ContentLabel',
-                    parent=styles['Normal'],
-                    fontName=self.FONT_NAME,
-                    fontSize=10,
-                    textColor=colors.black,
-                    bold=1,
-                    spaceAfter=3
+                    logger.warning("作品 %s 没有图片路径", design.get('title', '未知标题'))
+
+                # 添加详细信息：所有标签和内容合并为一个段落，作品间隔由样式的 spaceAfter 提供
+                fields = [
+                    ("序号", f"{page_num}-{i}"),
+                    ("标题", design.get('title') or '未知标题'),
+                    ("项目描述", design.get('description') or '暂无描述'),
+                    ("类型", design.get('type') or '未知类型'),
+                    ("作者", design.get('author') or '未知作者'),
+                    ("时间", design.get('date') or '未知时间')
+                ]
+                design_info = "<br/>".join(
+                    f'<font color="#000000">{label}:</font> {escape(str(value))}' for label, value in fields
                 )
-                content_value_style = ParagraphStyle(
-                    'ContentValue',
-                    parent=styles['Normal'],
-                    fontName=self.FONT_NAME,
-                    fontSize=10,
-                    textColor=colors.HexColor('#666666'),
-                    spaceAfter=8
-                )
-                description_style = ParagraphStyle(
-                     'DescriptionStyle',
-                     parent=styles['Normal'],
-                     fontName=self.FONT_NAME,
-                     fontSize=10,
-                     textColor=colors.HexColor('#666666'),
-                     spaceAfter=12,
-                     leading=14
-                )
-
-                # 添加序号
-                story.append(Paragraph("序号:", content_label_style))
-                story.append(Paragraph(f"{page_num}-{i}", content_value_style))
-
-                # 添加标题
-                story.append(Paragraph("标题:", content_label_style))
-                story.append(Paragraph(design.get('title', '未知标题'), content_value_style))
-
-                # 添加项目描述
-                story.append(Paragraph("项目描述:", content_label_style))
-                story.append(Paragraph(design.get('description', '暂无描述') or '暂无描述', description_style))
-
-                # 添加类型
-                story.append(Paragraph("类型:", content_label_style))
-                story.append(Paragraph(design.get('type', '未知类型') or '未知类型', content_value_style))
-
-                # 添加作者
-                story.append(Paragraph("作者:", content_label_style))
-                story.append(Paragraph(design.get('author', '未知作者') or '未知作者', content_value_style))
-
-                # 添加时间
-                story.append(Paragraph("时间:", content_label_style))
-                story.append(Paragraph(design.get('date', '未知时间') or '未知时间', content_value_style))
-
-                # 添加作品之间的间隔
-                story.append(Spacer(1, 20))
+                story.append(Paragraph(design_info, self.styles['DesignInfo']))
 
             except Exception as e:
-                logger.error(f"处理第 {page_num} 页的第 {i} 个作品时出错: {str(e)}", exc_info=True)
+                logger.error("处理第 %d 页的第 %d 个作品时出错: %s", page_num, i, e, exc_info=True)
                 continue
 
-        try:
-            # 生成临时PDF，不包含页眉页脚，以便合并时统一添加
-            doc.build(story)
-            logger.info(f"第 {page_num} 页临时PDF文件生成成功: {output_path}")
-            return output_path
-        except Exception as e:
-            logger.error(f"生成第 {page_num} 页临时PDF时出错: {str(e)}")
-            return None
+        return story
 
-    def create_cover_pdf(self, total_count: int, output_filename: str = "cover.pdf") -> Optional[str]:
-        """生成封面PDF"""
+    def create_cover_pdf(self, total_count: int, output_filename: str = "cover.pdf",
+                         number_pages: bool = True) -> Optional[str]:
+        """生成封面PDF，number_pages 为 False 时不绘制页码"""
         logger.info("开始生成封面PDF")
 
+        os.makedirs(self.temp_dir, exist_ok=True)
         output_path = os.path.join(self.temp_dir, output_filename)
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=5*cm,  # 增加顶部边距
-            bottomMargin=2*cm  # 调整底部边距
-        )
-
-        styles = getSampleStyleSheet()
-
-        # 封面主标题样式
-        cover_title_style = ParagraphStyle(
-            'CoverTitle',
-            parent=styles['Heading1'],
-            fontName=self.FONT_NAME,
-            fontSize=36,
-            spaceAfter=40,
-            alignment=1,
-            textColor=colors.HexColor('#1a1a1a'),
-            bold=1,
-            spaceBefore=8*cm # 增加顶部空间，帮助垂直居中
-        )
+        doc = self._create_doc(output_path, [self._cover_template()])
 
-        # 封面信息样式
-        cover_info_style = ParagraphStyle(
-            'CoverInfo',
-            parent=styles['Normal'],
-            fontName=self.FONT_NAME,
-            fontSize=14,
-            spaceAfter=15,
-            alignment=1,
-            textColor=colors.HexColor('#444444')
-        )
-
-        # 时间和作者样式
-        time_author_style = ParagraphStyle(
-            'TimeAuthorInfo',
-            parent=styles['Normal'],
-            fontName=self.FONT_NAME,
-            fontSize=10,
-            spaceAfter=0,
-            alignment=1,
-            textColor=colors.HexColor('#666666')
-        )
-
-        # 时间和作者行间距调整
-        time_style = ParagraphStyle(
-            'TimeInfo',
-            parent=time_author_style,
-            spaceAfter=0.2*cm # 调整时间和作者之间的间距
-        )
+        # 在封面后强制分页
+        story = self._cover_story(total_count) + [PageBreak()]
 
+        try:
+            doc.build(story, canvasmaker=NumberedCanvas if number_pages else canvas.Canvas)
+            logger.info("封面PDF生成完成")
+            return output_path
+        except Exception as e:
+             logger.error("生成封面PDF时出错: %s", e)
+             return None
 
+    def _cover_story(self, total_count: int) -> List:
+        """生成封面内容：主标题、作品总数、生成时间和作者信息"""
         story = []
 
         # 添加封面主标题
-        story.append(Paragraph("红点设计奖作品集", cover_title_style))
+        story.append(Paragraph("红点设计奖作品集", self.styles['CoverTitle']))
 
         # 添加总数信息
-        story.append(Paragraph(f"共收录 {total_count} 个设计作品", cover_info_style)) # 使用实际总数
+        story.append(Paragraph(f"共收录 {total_count} 个设计作品", self.styles['CoverInfo'])) # 使用实际总数
         story.append(Spacer(1, 1*cm)) # 减小信息与作者之间的间距
 
         # 添加作者信息
-        story.append(Paragraph(f"生成时间：{datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}", time_style))
-        story.append(Paragraph(f"tAngo/org.java.tango@gmail.com", time_author_style))
+        story.append(Paragraph(f"生成时间：{datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}", self.styles['CoverTimeInfo']))
+        story.append(Paragraph(f"tAngo/org.java.tango@gmail.com", self.styles['CoverTimeAuthorInfo']))
         story.append(Spacer(1, 0.5*cm)) # 添加一些小的间距
 
-        # 在封面后强制分页
-        story.append(PageBreak())
+        return story
 
-        try:
-            doc.build(story)
-            logger.info("封面PDF生成完成")
-            return output_path
-        except Exception as e:
-             logger.error(f"生成封面PDF时出错: {str(e)}")
-             return None
-
-    def merge_pdfs(self, temp_pdf_files: List[str], output_filename: str, total_count: int) -> Optional[str]:
-        """合并临时PDF文件并添加页码"""
-        logger.info(f"开始合并 {len(temp_pdf_files)} 个临时PDF文件到 {output_filename}")
+    def merge_pdfs(self, temp_pdf_files: List[str], output_filename: str, total_count: int,
+                   page_number_overlay: Optional[str] = None) -> Optional[str]:
+        """按顺序合并临时PDF文件；传入 page_number_overlay 时将其各页逐页叠加到合并结果上（全局页码）"""
+        logger.info("开始合并 %d 个临时PDF文件到 %s", len(temp_pdf_files), output_filename)
 
         if not temp_pdf_files:
             logger.warning("没有临时PDF文件可供合并。")
             return None
 
-        merger = PdfWriter()
         output_path = os.path.join(self.output_dir, output_filename)
 
         try:
-            # 计算总页数
-            total_pages = 0
-            for temp_pdf_file in temp_pdf_files:
-                if os.path.exists(temp_pdf_file):
-                    with open(temp_pdf_file, 'rb') as f:
-                        reader = PdfReader(f)
-                        total_pages += len(reader.pages)
-
-            current_page = 0
+            existing_pdf_files = []
             for temp_pdf_file in temp_pdf_files:
                 if not os.path.exists(temp_pdf_file):
-                    logger.warning(f"临时文件不存在，跳过: {temp_pdf_file}")
+                    logger.warning("临时文件不存在，跳过: %s", temp_pdf_file)
                     continue
+                existing_pdf_files.append(temp_pdf_file)
 
-                # 读取临时PDF文件
-                with open(temp_pdf_file, 'rb') as f:
-                    reader = PdfReader(f)
-                    for page in reader.pages:
-                        current_page += 1
-                        
-                        # 创建一个新的PDF页面用于绘制页码
-                        packet = BytesIO()
-                        can = canvas.Canvas(packet, pagesize=A4)
-                        
-                        # 设置页码文本
-                        page_number = f"第 {current_page} 页 / 共 {total_pages} 页"
-                        
-                        # 计算页码位置（右下角）
-                        width, height = A4
-                        margin = 1.5 * cm
-                        
-                        # 设置字体和颜色
-                        can.setFont(self.FONT_NAME, 9)
-                        can.setFillColor(colors.grey)
-                        
-                        # 计算文本宽度以进行右对齐
-                        text_width = can.stringWidth(page_number, self.FONT_NAME, 9)
-                        
-                        # 绘制页码（距离右边缘 margin，距离底边缘 margin）
-                        can.drawString(width - margin - text_width, margin, page_number)
-                        
-                        # 保存canvas
-                        can.save()
-                        packet.seek(0)
-                        
-                        # 创建包含页码的新页面
-                        page_with_number = PdfReader(packet).pages[0]
-                        
-                        # 将页码页面合并到原始页面
-                        page.merge_page(page_with_number)
-                        
-                        # 将处理后的页面添加到合并器
-                        merger.add_page(page)
-
-            # 写入合并后的PDF文件
-            with open(output_path, 'wb') as f:
-                merger.write(f)
-
-            logger.info(f"PDF 文件合并成功: {output_path}")
-
-            # 移动临时文件到输出目录
-            for temp_pdf_file in temp_pdf_files:
-                if os.path.exists(temp_pdf_file):
-                    target_temp_path = os.path.join(os.path.dirname(output_path), os.path.basename(temp_pdf_file))
-                    try:
-                        # 如果目标文件已存在，先删除
-                        if os.path.exists(target_temp_path):
-                            os.remove(target_temp_path)
-                        import shutil
-                        shutil.move(temp_pdf_file, target_temp_path)
-                        logger.debug(f"临时文件移动成功: {temp_pdf_file} -> {target_temp_path}")
-                    except Exception as e:
-                        logger.warning(f"移动临时文件失败 {temp_pdf_file}: {str(e)}")
+            # 顺序拼接；页码要么已在生成各个 PDF 时绘制，要么在拼接的同时叠加
+            if QPDF_BIN:
+                self._merge_with_qpdf(existing_pdf_files, output_path, page_number_overlay)
+            elif pikepdf is not None:
+                self._merge_with_pikepdf(existing_pdf_files, output_path, page_number_overlay)
+            else:
+                self._merge_with_pypdf2(existing_pdf_files, output_path, page_number_overlay)
+
+            logger.info("PDF 文件合并成功: %s", output_path)
+
+            # 调试模式下保留临时文件：一次扫描临时目录，全部移动到输出目录
+            if config.KEEP_TEMP:
+                with os.scandir(self.temp_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        target_temp_path = os.path.join(self.output_dir, entry.name)
+                        try:
+                            try:
+                                # 同一文件系统内直接重命名，目标已存在时覆盖（Windows 上同样适用）
+                                os.replace(entry.path, target_temp_path)
+                            except OSError:
+                                # 跨文件系统时复制后删除
+                                shutil.move(entry.path, target_temp_path)
+                            logger.debug("临时文件移动成功: %s -> %s", entry.path, target_temp_path)
+                        except OSError as e:
+                            logger.warning("移动临时文件失败 %s: %s", entry.path, e)
 
             return output_path
 
         except Exception as e:
-            logger.error(f"合并PDF文件时出错: {str(e)}", exc_info=True)
+            logger.error("合并PDF文件时出错: %s", e, exc_info=True)
             return None
         finally:
-            # 清空临时目录
-            if os.path.exists(self.temp_dir):
-                import shutil
+            # 清空临时目录（调试模式下保留）
+            if not config.KEEP_TEMP and os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
-                logger.info(f"临时目录已清理: {self.temp_dir}")
+                logger.info("临时目录已清理: %s", self.temp_dir)
+
+    def _merge_with_qpdf(self, pdf_files: List[str], output_path: str, overlay_path: Optional[str] = None):
+        """调用 qpdf 命令行拼接，页面数据流式写出，不在 Python 进程中驻留"""
+        overlay_args = ['--overlay', overlay_path, '--'] if overlay_path else []
+        result = subprocess.run(
+            [QPDF_BIN, '--object-streams=generate', '--empty', '--pages', *pdf_files, '--', *overlay_args, output_path],
+            capture_output=True,
+            text=True
+        )
+        # qpdf 退出码 3 表示成功但有警告
+        if result.returncode not in (0, 3):
+            raise RuntimeError(f"qpdf 合并失败 (退出码 {result.returncode}): {result.stderr.strip()}")
+        if result.returncode == 3:
+            logger.warning("qpdf 合并时出现警告: %s", result.stderr.strip())
+
+    def _merge_with_pikepdf(self, pdf_files: List[str], output_path: str, overlay_path: Optional[str] = None):
+        """使用 pikepdf (qpdf) 按页对象引用拼接，原生序列化写出"""
+        with contextlib.ExitStack() as stack:
+            merged = stack.enter_context(pikepdf.Pdf.new())
+            for pdf_file in pdf_files:
+                # 源文件需保持打开直到保存完成；以 mmap 方式打开，页面流数据按需从源文件读取，不整体载入内存
+                src = stack.enter_context(pikepdf.open(pdf_file, access_mode=pikepdf.AccessMode.mmap))
+                merged.pages.extend(src.pages)
+            if overlay_path:
+                # 页码页作为表单对象叠加到对应页上，不改动原页面内容流
+                overlay = stack.enter_context(pikepdf.open(overlay_path))
+                for page, overlay_page in zip(merged.pages, overlay.pages):
+                    page.add_overlay(overlay_page)
+            # 流数据原样拷贝，不解码也不重新压缩；非流对象打包进压缩的对象流，减小交叉引用和字典的体积
+            merged.save(
+                output_path,
+                linearize=False,
+                compress_streams=False,
+                stream_decode_level=pikepdf.StreamDecodeLevel.none,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate
+            )
+
+    def _merge_with_pypdf2(self, pdf_files: List[str], output_path: str, overlay_path: Optional[str] = None):
+        """未安装 pikepdf 时使用 pypdf / PyPDF2 拼接，append 直接复用已解析的页面对象"""
+        merger = PdfWriter()
+        for pdf_file in pdf_files:
+            merger.append(pdf_file)
+        if overlay_path:
+            for page, overlay_page in zip(merger.pages, PdfReader(overlay_path).pages):
+                page.merge_page(overlay_page)
 
-    def test_pdf_styles(self):
-        """测试PDF样式"""
-        try:
-            # 确保临时目录存在
-            if not os.path.exists(self.temp_dir):
-                os.makedirs(self.temp_dir)
-            
-            # 创建测试数据
-            test_design = {
-                'title': '测试作品标题',
-                'type': '产品设计',
-                'author': '测试作者',
-                'date': '2024',
-                'description': '这是一个测试作品描述。'
-            }
-            
-            # 测试生成PDF
-            output_filename = "test_styles.pdf"
-            result = self.generate_full_pdf([test_design], output_filename)
-            
-            # 验证结果
-            assert result is not None, "PDF生成结果不应为None"
-            assert os.path.exists(result), "生成的PDF文件应该存在"
-            
-            logger.info("PDF样式测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"PDF样式测试失败: {str(e)}", exc_info=True)
-            return False
-        finally:
-            # 清理测试文件
-            if os.path.exists(self.temp_dir):
-                import shutil
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+        # 写入合并后的PDF文件；PdfWriter 按对象逐个小块写出，使用 4 MiB 缓冲合并为少量大块写入
+        with open(output_path, 'wb', buffering=4 * 1024 * 1024) as f:
+            merger.write(f)
 
     def generate_full_pdf(self, designs: List[Dict], output_filename: str) -> Optional[str]:
-        """生成包含所有作品的完整 PDF"""
+        """生成包含所有作品的完整 PDF：封面和所有数据页放在同一个文档中一次生成，无需临时文件和合并"""
         if not designs:
             logger.warning("没有作品数据可生成 PDF")
             return None
-            
+
+        # 按每页作品数将作品分片
+        page_size = config.PDF_PAGE_SIZE
+        batches = [designs[i:i + page_size] for i in range(0, len(designs), page_size)]
+        logger.info("开始生成完整 PDF: %d 个数据页 (共 %d 个作品)", len(batches), len(designs))
+
         output_path = os.path.join(self.output_dir, output_filename)
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
-        
-        elements = []
-        
-        # 添加封面
-        elements.extend(self.create_cover_page("红点设计奖作品集", len(designs)))
-        
-        # 添加内容页
-        for i, design in enumerate(designs, 1):
-            elements.extend(self.create_content_page(design, i, len(designs)))
-        
+        doc = self._create_doc(output_path, [self._cover_template(), self._body_template()])
+
+        # 一次并发下载全部作品的图片，连接池在整个作品集内复用，不再逐页等待
+        local_images = self._prefetch_images(designs)
+
+        # 封面之后切换到内容页模板，每个数据页从新的一页开始
+        story = self._cover_story(len(designs))
+        for page_num, batch in enumerate(batches, 1):
+            story.extend([NextPageTemplate('body'), PageBreak()])
+            story.extend(self._page_story(batch, page_num, local_images))
+
         try:
-            doc.build(elements)
-            logger.info(f"PDF 文件生成成功: {output_path}")
+            doc.multiBuild(story, canvasmaker=NumberedCanvas)
+            logger.info("完整 PDF 生成成功: %s", output_path)
             return output_path
         except Exception as e:
-            logger.error(f"生成 PDF 文件失败: {str(e)}")
+            logger.error("生成完整 PDF 时出错: %s", e, exc_info=True)
+            return None
+
+    def generate_full_pdf_parallel(self, designs: List[Dict], output_filename: str) -> Optional[str]:
+        """生成完整 PDF 的多进程版本：按页分片，使用进程池并行生成临时页 PDF 后统一合并，适合超大作品集"""
+        if not designs:
+            logger.warning("没有作品数据可生成 PDF")
             return None
 
+        # 按每页作品数将作品分片
+        page_size = config.PDF_PAGE_SIZE
+        batches = [designs[i:i + page_size] for i in range(0, len(designs), page_size)]
+        logger.info("开始并行生成 %d 个临时页 PDF (共 %d 个作品)", len(batches), len(designs))
+
+        # 各文件单独生成时不绘制页码，合并时按全局页码统一叠加
+        cover_path = self.create_cover_pdf(len(designs), number_pages=False)
+        if cover_path is None:
+            logger.error("封面PDF生成失败，停止生成完整 PDF")
+            return None
+        temp_pdf_files = self.generate_pages_parallel(batches, number_pages=False)
+
+        ordered_pdf_files = [cover_path] + [path for path in temp_pdf_files if path]
+        # 只读取各文件的页面树统计页数，不重新排版
+        total_pages = sum(_count_pdf_pages(path) for path in ordered_pdf_files)
+        overlay_path = os.path.join(self.temp_dir, "page_numbers.pdf")
+        _create_page_number_overlay(overlay_path, total_pages)
+        return self.merge_pdfs(ordered_pdf_files, output_filename, len(designs), page_number_overlay=overlay_path)
+
+    def generate_pages_parallel(self, designs_chunks: List[List[Dict]], number_pages: bool = True) -> List[Optional[str]]:
+        """使用进程池并行生成临时页 PDF，第 N 个分片对应第 N 页，返回按页序排列的文件路径（失败的页为 None）"""
+        # macOS 上 fork 不安全，使用 spawn 启动子进程
+        mp_context = multiprocessing.get_context("spawn") if platform.system() == 'Darwin' else None
+
+        # 每个工作进程自行构造 PdfGenerator，只需传递可序列化的作品数据和输出目录
+        temp_pdf_files: List[Optional[str]] = [None] * len(designs_chunks)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=config.PDF_WORKERS, mp_context=mp_context) as executor:
+            # 提交任务到进程池，记录每个任务对应的分片序号
+            future_to_index = {
+                executor.submit(_create_temp_page_pdf_worker, chunk, page_num, self.output_dir, number_pages): page_num - 1
+                for page_num, chunk in enumerate(designs_chunks, 1)
+            }
+
+            # 收集结果，按提交顺序放回列表
+            for future in concurrent.futures.as_completed(future_to_index):
+                index = future_to_index[future]
+                try:
+                    temp_pdf_files[index] = future.result()
+                except Exception as e:
+                    logger.error("第 %d 页临时PDF并行生成失败: %s", index + 1, e, exc_info=True)
+
+        return temp_pdf_files
+
     def create_cover_page(self, title: str, total_count: int) -> List:
         """创建封面页"""
         elements = []
         
         # 添加标题
-        elements.append(Paragraph(title, self.styles['ChineseTitle']))
+        elements.append(Paragraph(escape(title), self.styles['ChineseTitle']))
         elements.append(Spacer(1, 2*cm))
         
         # 添加时间和作者信息
@@ -649,34 +886,33 @@ class PdfGenerator:
         """创建内容页"""
         elements = []
         
-        # 添加标题
-        elements.append(Paragraph(design['title'], self.styles['ChineseTitle']))
+        # 添加标题（Paragraph 按 XML 解析，内容需转义）
+        elements.append(Paragraph(escape(design['title']), self.styles['ChineseTitle']))
         elements.append(Spacer(1, 1*cm))
         
         # 添加图片
         if 'image_path' in design and os.path.exists(design['image_path']):
             try:
-                img = Image(design['image_path'])
-                # 调整图片大小以适应页面
-                img.drawHeight = min(img.drawHeight, 400)
-                img.drawWidth = min(img.drawWidth, 400)
-                elements.append(img)
+                # 只读取文件头获取尺寸，调整图片大小以适应页面后只创建一次 Image
+                img_width, img_height = _fast_image_size(design['image_path'])
+                elements.append(Image(design['image_path'], width=min(img_width, 400), height=min(img_height, 400), lazy=2))
                 elements.append(Spacer(1, 1*cm))
             except Exception as e:
-                logger.error(f"加载图片失败: {str(e)}")
+                logger.error("加载图片失败: %s", e)
         
         # 添加作品信息
-        info_items = [
-            ('类型', design.get('type', '')),
-            ('作者', design.get('author', '')),
-            ('日期', design.get('date', '')),
-            ('描述', design.get('description', ''))
-        ]
+        info_items = (
+            ('类型', design.get('type')),
+            ('作者', design.get('author')),
+            ('日期', design.get('date')),
+            ('描述', design.get('description'))
+        )
         
-        for label, content in info_items:
-            if content:
-                elements.append(Paragraph(f"{label}：{content}", self.styles['ChineseLabel']))
-                elements.append(Spacer(1, 0.3*cm))
+        # 所有字段合并为一个 Paragraph，减少排版时的 flowable 数量
+        info_lines = [f"{label}：{escape(str(content))}" for label, content in info_items if content]
+        if info_lines:
+            elements.append(Paragraph('<br/>'.join(info_lines), self.styles['ChineseLabel']))
+            elements.append(Spacer(1, 0.3*cm))
         
         # 添加页码
         elements.append(Spacer(1, 1*cm))
@@ -686,206 +922,150 @@ class PdfGenerator:
         elements.append(PageBreak())
         return elements
 
-    def _create_test_pdf(self, filename: str, num_pages: int = 1) -> str:
-        """创建测试用的PDF文件"""
-        # 确保临时目录存在
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
-            
-        output_path = os.path.join(self.temp_dir, filename)
-        packet = BytesIO()
-        can = canvas.Canvas(packet, pagesize=A4)
-        
-        # 只创建一页测试内容
-        can.drawString(100, 750, f"Test Page")
-        can.showPage()
-        
-        can.save()
-        packet.seek(0)
-        
-        with open(output_path, 'wb') as f:
-            f.write(packet.getvalue())
-        
-        logger.info(f"创建测试PDF文件: {output_path}")
-        return output_path  # 返回完整路径
-
-    def test_merge_pdfs(self):
-        """测试PDF合并功能"""
-        try:
-            # 确保临时目录存在
-            if not os.path.exists(self.temp_dir):
-                os.makedirs(self.temp_dir)
-            
-            # 创建测试PDF文件
-            test_files = []
-            for i in range(3):
-                filename = f"test_{i}.pdf"
-                filepath = self._create_test_pdf(filename)
-                test_files.append(filepath)
-                logger.info(f"创建测试文件: {filepath}")
-            
-            # 验证测试文件是否创建成功
-            for filepath in test_files:
-                assert os.path.exists(filepath), f"测试文件不存在: {filepath}"
-            
-            # 测试合并
-            output_filename = "test_merged.pdf"
-            result = self.merge_pdfs(test_files, output_filename, 3)
-            
-            # 验证结果
-            assert result is not None, "合并结果不应为None"
-            assert os.path.exists(result), "合并后的文件应该存在"
-            
-            # 验证页码
-            with open(result, 'rb') as f:
-                reader = PdfReader(f)
-                assert len(reader.pages) == 3, "应该有3页（3个文件，每个1页）"
-            
-            logger.info("PDF合并测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"PDF合并测试失败: {str(e)}", exc_info=True)
-            return False
-        finally:
-            # 清理测试文件
-            if os.path.exists(self.temp_dir):
-                import shutil
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_create_temp_page_pdf(self):
-        """测试临时PDF页面创建功能"""
-        try:
-            # 确保临时目录存在
-            if not os.path.exists(self.temp_dir):
-                os.makedirs(self.temp_dir)
-            
-            # 创建测试数据
-            test_designs = [
-                {
-                    'title': 'Test Design 1',
-                    'designer': 'Test Designer 1',
-                    'description': 'Test Description 1',
-                    'type': 'Test Type 1',
-                    'author': 'Test Author 1',
-                    'date': '2024',
-                    'image_path': 'https://www.red-dot.org/index.php?fr=2137249&token=9b5715d28268e9614b57089d0c54caae80f1d214&eID=tx_solr_image&size=large&usage=overview'
-                }
-            ]
-            
-            # 测试创建临时PDF
-            result = self.create_temp_page_pdf(test_designs, 1)
-            
-            # 验证结果
-            assert result is not None, "临时PDF创建结果不应为None"
-            assert os.path.exists(result), "临时PDF文件应该存在"
-            
-            logger.info("临时PDF创建测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"临时PDF创建测试失败: {str(e)}", exc_info=True)
-            return False
-        finally:
-            # 清理测试文件
-            if os.path.exists(self.temp_dir):
-                import shutil
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def _download_image(self, url: str) -> Optional[str]:
-        """下载图片并返回本地文件路径"""
+        """下载图片到图片缓存目录并返回本地文件路径，已缓存的图片直接复用"""
         try:
-            import requests
-            from urllib.parse import urlparse
-            from pathlib import Path
-            
-            # 创建临时图片目录
-            temp_img_dir = os.path.join(self.temp_dir, 'images')
-            if not os.path.exists(temp_img_dir):
-                os.makedirs(temp_img_dir)
-            
-            # 从URL中提取文件名
-            parsed_url = urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-            if not filename:
-                filename = f"image_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            
-            # 下载图片
-            response = requests.get(url)
-            if response.status_code == 200:
-                temp_img_path = os.path.join(temp_img_dir, filename)
-                with open(temp_img_path, 'wb') as f:
-                    f.write(response.content)
-                logger.info(f"图片下载成功: {temp_img_path}")
-                return temp_img_path
-            else:
-                logger.warning(f"图片下载失败，状态码: {response.status_code}")
-                return None
-                
+            # 以 URL 的 sha256 作为缓存键，旁路 JSON 记录文件名和缓存校验信息
+            key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+            meta_path = os.path.join(self.image_cache_dir, key + '.meta.json')
+            cached_path = None
+            headers = {}
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if os.path.exists(os.path.join(self.image_cache_dir, meta['file'])):
+                    cached_path = os.path.join(self.image_cache_dir, meta['file'])
+                    # 与爬虫一致：默认直接复用缓存；开启 IMAGE_REVALIDATE 时带上 ETag / Last-Modified 发送条件请求
+                    if not config.IMAGE_REVALIDATE:
+                        logger.debug("命中图片缓存: %s", url)
+                        return cached_path
+                    if meta.get('etag'):
+                        headers['If-None-Match'] = meta['etag']
+                    if meta.get('last_modified'):
+                        headers['If-Modified-Since'] = meta['last_modified']
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                # 旁路文件不存在或已损坏时视为未缓存，重新下载
+                pass
+
+            # 下载图片，响应体不预加载，直接流式写入文件
+            response = self._http.request('GET', url, headers=headers, preload_content=False, timeout=config.REQUEST_TIMEOUT)
+            try:
+                if response.status == 304 and cached_path:
+                    logger.debug("图片未变化，使用缓存: %s", cached_path)
+                    return cached_path
+                if response.status != 200:
+                    logger.warning("图片下载失败，状态码: %s", response.status)
+                    return None
+
+                # 根据 Content-Type 确定后缀
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+                extension = mimetypes.guess_extension(content_type) or '.jpg'
+                filename = key + extension
+
+                # 先写入临时文件再重命名，避免中断时留下不完整的缓存
+                cached_path = os.path.join(self.image_cache_dir, filename)
+                with open(cached_path + '.part', 'wb') as f:
+                    shutil.copyfileobj(response, f, 64 * 1024)
+                os.replace(cached_path + '.part', cached_path)
+
+                # 旁路文件同样先写临时文件再重命名，中断时不会留下截断的 JSON
+                with open(meta_path + '.part', 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'file': filename,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified')
+                    }, f)
+                os.replace(meta_path + '.part', meta_path)
+            finally:
+                response.release_conn()
+
+            logger.debug("图片下载成功: %s", cached_path)
+            return cached_path
+
         except Exception as e:
-            logger.error(f"下载图片时出错: {str(e)}", exc_info=True)
+            logger.error("下载图片时出错: %s", e, exc_info=True)
             return None
 
-    def test_download_image(self):
-        """测试图片下载功能"""
+    def _prepare_image(self, src_path: str, max_px: int = 1200) -> str:
+        """返回适合嵌入 PDF 的图片路径，同一进程内按 (原图, 修改时间, 目标尺寸) 记住结果，重复出现的图片不再打开文件"""
         try:
-            # 使用一个测试图片URL
-            test_url = "https://www.red-dot.org/index.php?fr=2137260&token=e17ce4894cc13551a7048317f716af823a956088&eID=tx_solr_image&size=large&usage=overview"
-            
-            # 测试下载
-            result = self._download_image(test_url)
-            
-            # 验证结果
-            assert result is not None, "下载结果不应为None"
-            assert os.path.exists(result), "下载的文件应该存在"
-            
-            logger.info("图片下载测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"图片下载测试失败: {str(e)}", exc_info=True)
-            return False
-        finally:
-            # 清理测试文件
-            if os.path.exists(self.temp_dir):
-                import shutil
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+            key = (src_path, os.stat(src_path).st_mtime_ns, max_px)
+        except OSError:
+            return src_path
+        if key not in self._prepared_images:
+            self._prepared_images[key] = self._resize_image(src_path, max_px)
+        return self._prepared_images[key]
+
+    def _resize_image(self, src_path: str, max_px: int) -> str:
+        """将图片缩小到不超过 max_px 像素并转为 JPEG，结果缓存在原图旁，失败时返回原图路径"""
+        try:
+            dst_path = f"{os.path.splitext(src_path)[0]}_{max_px}.jpg"
+            # 原图被重新下载覆盖后，旁边的旧缩略图已过期，需重新生成
+            if os.path.exists(dst_path) and os.path.getmtime(dst_path) >= os.path.getmtime(src_path):
+                return dst_path
 
-    def run_all_tests(self):
-        """运行所有测试"""
-        test_results = {
-            'merge_pdfs': self.test_merge_pdfs(),
-            'create_temp_page_pdf': self.test_create_temp_page_pdf(),
-            'pdf_styles': self.test_pdf_styles(),
-            'download_image': self.test_download_image()
-        }
-        
-        # 打印测试结果
-        print("\n" + "="*50)
-        print("测试结果汇总:")
-        print("="*50)
-        
-        all_passed = True
-        for test_name, result in test_results.items():
-            status = "✅ 通过" if result else "❌ 失败"
-            print(f"{test_name:20} : {status}")
-            if not result:
-                all_passed = False
-        
-        print("="*50)
-        print(f"总体结果: {'✅ 全部通过' if all_passed else '❌ 部分失败'}")
-        print("="*50 + "\n")
-        
-        return all_passed
+            with PILImage.open(src_path) as img:
+                # 已经足够小的 JPEG 无需重新编码
+                if img.format == 'JPEG' and max(img.size) <= max_px:
+                    return src_path
 
-# 如果直接运行此文件，执行测试
-if __name__ == '__main__':
-    # 创建测试实例
-    test_generator = PdfGenerator()
-    
-    # 运行所有测试
-    success = test_generator.run_all_tests()
-    
-    # 设置退出码
-    import sys
-    sys.exit(0 if success else 1) 
\ No newline at end of file
+                # JPEG 使用 draft 模式在解码阶段按 1/2、1/4、1/8 缩小，避免解码整幅原图
+                if img.format == 'JPEG':
+                    img.draft('RGB', (max_px, max_px))
+
+                img.thumbnail((max_px, max_px), PILImage.LANCZOS)
+
+                # 透明背景铺白色，避免转 RGB 后变黑
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    img = img.convert('RGBA')
+                    background = PILImage.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=img.split()[-1])
+                    img = background
+
+                # 灰度图保持单通道，数据量只有 RGB 的三分之一
+                mode = 'L' if img.mode in ('L', '1') else 'RGB'
+                img.convert(mode).save(dst_path, 'JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=False)
+
+            logger.debug("图片已缩放: %s -> %s", src_path, dst_path)
+            return dst_path
+
+        except Exception as e:
+            logger.warning("缩放图片失败，使用原图: %s - %s", src_path, e)
+            return src_path
+
+    def _dedup_image(self, image_path: str) -> str:
+        """按文件内容的 blake2b 摘要识别相同图片，返回首次出现的路径；每个路径只计算一次摘要"""
+        canonical_path = self._image_paths.get(image_path)
+        if canonical_path is None:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(image_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    digest.update(chunk)
+            canonical_path = self._image_cache.setdefault(digest.digest(), image_path)
+            self._image_paths[image_path] = canonical_path
+        return canonical_path
+
+    def _prefetch_images(self, designs: List[Dict]) -> Dict[str, Optional[str]]:
+        """并行下载作品中的远程图片，返回 URL 到本地文件路径的映射"""
+        urls = {
+            design['image_path'] for design in designs
+            if design.get('image_path') and design['image_path'].startswith('http')
+        }
+        if not urls:
+            return {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=config.NUM_THREADS) as executor:
+            future_to_url = {executor.submit(self._download_image, url): url for url in urls}
+            return {future_to_url[future]: future.result() for future in concurrent.futures.as_completed(future_to_url)}
+
+def _create_temp_page_pdf_worker(designs: List[Dict], page_num: int, output_dir: str,
+                                 number_pages: bool = True) -> Optional[str]:
+    """进程池工作函数：在子进程中构造 PdfGenerator 并生成单个临时页 PDF"""
+    generator = PdfGenerator(output_dir=output_dir)
+    return generator.create_temp_page_pdf(designs, page_num, number_pages)
+
+def _count_pdf_pages(path: Optional[str]) -> int:
+    """PDF 文件的页数，只解析页面树；文件缺失（生成失败）时为 0"""
+    if not path or not os.path.exists(path):
+        return 0
+    return len(PdfReader(path).pages)
@@ -1,12 +1,15 @@
 import os
 import json
 import time
+import shelve
+import threading
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import csv # 导入 csv 模块
 import hashlib # 导入 hashlib 用于生成文件名
-import mimetypes # 导入 mimetypes 用于根据 Content-Type 获取后缀
+import importlib.metadata
+import shutil
 
 # 导入并发库
 import concurrent.futures
@@ -19,8 +22,31 @@ from pdf_generator import PdfGenerator
 
 from io import BytesIO
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson 解析和序列化 JSON 比标准库快数倍；未安装时使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# selectolax (lexbor 后端) 基于 C 实现的 HTML 解析器，解析详情页比 BeautifulSoup 快得多；未安装时使用 BeautifulSoup + lxml
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# requests-cache 把响应缓存到本地 SQLite，重复运行时不再重复下载；未安装时使用普通 Session
+try:
+    from requests_cache import CachedSession
+    # 1.0 起清理过期响应改用 delete(expired=True)，旧版本的 delete 只接受单个 key
+    REQUESTS_CACHE_V1 = int(importlib.metadata.version('requests-cache').split('.')[0]) >= 1
+except ImportError:
+    CachedSession = None
+    REQUESTS_CACHE_V1 = False
 import platform
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from PIL import Image as PILImage # 导入 PIL 库用于图片处理
 
 # 配置日志
@@ -34,215 +60,392 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _dump_doc(doc: Dict) -> str:
+    """将 API 返回的作品数据序列化为单行 JSON，用于日志"""
+    if orjson is not None:
+        return orjson.dumps(doc).decode('utf-8')
+    return json.dumps(doc, ensure_ascii=False)
+
+def _url_key(url: str) -> int:
+    """URL 的 64 位 blake2b 摘要，用于去重集合，比保存完整 URL 字符串省内存"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def _load_image_meta(meta_path: str) -> Optional[Dict]:
+    """读取图片的 .meta.json，文件不存在、内容损坏或缺少文件名时视为未缓存"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or not isinstance(meta.get('file'), str):
+        return None
+    return meta
+
+def _save_image_meta(meta_path: str, meta: Dict):
+    """先写入临时文件再重命名，中断时不会留下截断的 .meta.json"""
+    with open(meta_path + '.part', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.part', meta_path)
+
+def _probe_image(directory: str, name_hash: str) -> Optional[Tuple[str, Optional[Dict]]]:
+    """在目录中查找以 name_hash 命名的图片，返回 (图片路径, 旁路信息)；没有 .meta.json 时按常见后缀逐个查找"""
+    meta = _load_image_meta(os.path.join(directory, name_hash + '.meta.json'))
+    if meta is not None and os.path.exists(os.path.join(directory, meta['file'])):
+        return os.path.join(directory, meta['file']), meta
+    for extension in _IMAGE_EXTS:
+        path = os.path.join(directory, name_hash + extension)
+        if os.path.exists(path):
+            return path, None
+    return None
+
+def _is_detail_block(css_class: Optional[str]) -> bool:
+    """SoupStrainer 过滤条件：匹配 class 含 description 或 credits 的 div (兼容多个 class 的情况)"""
+    return bool(css_class) and not {'description', 'credits'}.isdisjoint(css_class.split())
+
+# 详情页只需要描述块和 credits 块，模块加载时构造一次过滤器，所有详情页共用
+DETAIL_STRAINER = SoupStrainer('div', class_=_is_detail_block)
+
+def _parse_details_selectolax(content: bytes) -> Tuple[str, List[str]]:
+    """用 selectolax 解析详情页，返回描述和 credits 块中的所有值"""
+    tree = HTMLParser(content)
+    description_node = tree.css_first('div.description')
+    description = description_node.text(strip=True) if description_node else ''
+
+    author_parts = []
+    credits_node = tree.css_first('div.credits')
+    if credits_node:
+        for li in credits_node.css('li'):
+            value_node = li.css_first('div.value')
+            if value_node:
+                value = value_node.text(strip=True)
+                if value: # 只添加非空的值
+                    author_parts.append(value)
+    return description, author_parts
+
+def _parse_details_bs4(content: bytes) -> Tuple[str, List[str]]:
+    """用 BeautifulSoup + lxml 解析详情页，返回描述和 credits 块中的所有值"""
+    # 只解析描述块和 credits 块，跳过页面其余部分
+    soup = BeautifulSoup(content, 'lxml', parse_only=DETAIL_STRAINER) # 传入 bytes，由 lxml 自行识别编码
+
+    description = ''
+    description_div = soup.find('div', class_='description')
+    if description_div:
+        description = description_div.get_text(strip=True)
+
+    author_parts = [] # 使用列表收集所有作者相关的价值内容
+    credits_div = soup.find('div', class_='credits')
+    if credits_div:
+        # 查找所有的 li.flex 元素
+        for li in credits_div.find_all('li'):
+            value_div = li.find('div', class_='value') # 查找 value 块
+            if value_div:
+                value = value_div.get_text(strip=True)
+                if value: # 只添加非空的值
+                    author_parts.append(value)
+    return description, author_parts
+
+# CSV 文件的列，顺序与作品字典的字段顺序一致，追加到旧文件时表头保持不变
+CSV_FIELDS = ('title', 'description', 'type', 'image_url', 'author', 'date', 'detail_url', 'image_path')
+
+# 常见图片 Content-Type 对应的文件后缀，下载时直接查表，不再每次调用 mimetypes
+_EXT_BY_CT = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/pjpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/svg+xml': '.svg',
+    'image/bmp': '.bmp',
+    'image/tiff': '.tiff',
+}
+
+# 图片文件可能使用的后缀，旁路文件缺失时按这些后缀查找已下载的图片
+_IMAGE_EXTS = tuple(dict.fromkeys(_EXT_BY_CT.values()))
+
+def create_session(cache_dir: str = config.OUTPUT_DIR) -> requests.Session:
+    """创建带连接池和自动重试的 Session，所有请求复用 keep-alive 连接；启用 HTTP 缓存时缓存文件保存在 cache_dir"""
+    retry = Retry(
+        total=config.MAX_RETRIES,
+        backoff_factor=config.RETRY_DELAY,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'], # 只重试幂等的 GET 请求
+        respect_retry_after_header=True, # 429/503 带 Retry-After 时按服务器要求等待
+        raise_on_status=False # 重试用尽后返回最后一次响应，由 raise_for_status 抛出
+    )
+    # 每个主机的连接池容量随线程数调整：作品线程池加上列表预取线程都能拿到空闲连接，不会因池满而丢弃连接
+    adapter = HTTPAdapter(pool_connections=config.NUM_THREADS, pool_maxsize=config.NUM_THREADS * 2, max_retries=retry)
+    if CachedSession is not None and config.HTTP_CACHE_EXPIRE:
+        os.makedirs(cache_dir, exist_ok=True)
+        session = CachedSession(
+            os.path.join(cache_dir, 'http_cache'),
+            backend='sqlite',
+            expire_after=config.HTTP_CACHE_EXPIRE,
+            allowable_methods=('GET',),
+            allowable_codes=(200,)
+        )
+        # 启动时清理过期的缓存响应 (新旧版本 API 不同)
+        if REQUESTS_CACHE_V1:
+            session.cache.delete(expired=True)
+        else:
+            session.cache.remove_expired_responses()
+        logger.info("已启用 HTTP 响应缓存")
+    else:
+        session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 class RedDotCrawler:
     def __init__(self,
                  base_url: str = config.BASE_URL,
                  output_dir: str = config.OUTPUT_DIR,
-                 site_base_url: str = config.SITE_BASE_URL):
+                 site_base_url: str = config.SITE_BASE_URL,
+                 session: Optional[requests.Session] = None,
+                 images_dir: Optional[str] = None,
+                 image_digests: Optional[Dict[bytes, str]] = None):
         self.base_url = base_url
         self.output_dir = output_dir
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-        # 创建图片保存目录
-        self.images_dir = os.path.join(self.output_dir, "images")
-        if not os.path.exists(self.images_dir):
-            os.makedirs(self.images_dir)
+        # 创建图片保存目录；可由调用方传入，多个分类共用一个图片目录，跨分类重复的图片只下载一次
+        category_images_dir = os.path.join(self.output_dir, "images")
+        self.images_dir = images_dir or category_images_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.images_dir, exist_ok=True)
+        # 旧版本按分类保存图片，共用图片目录时沿用分类目录中已下载的图片
+        self._legacy_images_dirs = [category_images_dir] if self.images_dir != category_images_dir and os.path.isdir(category_images_dir) else []
         logger.info("初始化爬虫")
         self.site_base_url = site_base_url
-        self.seen_design_ids = set() # 添加一个集合用于存储已见过的作品ID
+        self.seen_design_ids: Set[int] = set() # 已见过的作品URL的 64 位摘要
+        # 所有请求共用一个 Session，重试由 adapter 负责；可由调用方传入，在多个爬虫实例间复用连接池
+        self._owns_session = session is None
+        self.session = session if session is not None else create_session(self.output_dir)
+        # 图片内容摘要 -> 首个保存该内容的文件路径；与图片目录一起由调用方传入时在所有分类间共用
+        self._image_digests: Dict[bytes, str] = image_digests if image_digests is not None else {}
+        # 详情页解析结果按 URL 缓存到磁盘，重复运行时不再请求详情页；shelve 不是线程安全的，访问时加锁
+        self._details_cache = shelve.open(os.path.join(self.output_dir, 'details_cache')) if config.DETAILS_CACHE_DAYS else None
+        self._details_cache_lock = threading.Lock()
+        # 详情页和图片请求共用的 I/O 线程池，在所有页之间复用，不再每页重新创建线程
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=config.NUM_THREADS, thread_name_prefix='reddot-io')
         
         # 初始化 PdfGenerator 实例
         self.pdf_generator = PdfGenerator(output_dir=self.output_dir)
 
+    def close(self):
+        """关闭 I/O 线程池和爬虫自己创建的 Session，调用方传入的 Session 由调用方负责关闭"""
+        self._io_executor.shutdown(wait=True)
+        if self._details_cache is not None:
+            with self._details_cache_lock:
+                self._details_cache.close()
+                self._details_cache = None
+        if self._owns_session:
+            self.session.close()
+
     def get_design_details(self, detail_url: str) -> Optional[Dict]:
         """从详情页抓取额外数据，例如描述"""
-        max_retries = config.MAX_RETRIES
-        retry_delay = config.RETRY_DELAY # 秒
-
-        for retry_num in range(max_retries):
-            try:
-                logger.info(f"开始抓取详情页数据 (尝试 {retry_num + 1}/{max_retries}): {detail_url}")
-                response = requests.get(detail_url, timeout=config.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                
-                logger.info("详情页请求成功，开始解析")
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                description = ''
-                description_div = soup.find('div', class_='description')
-                if description_div:
-                    description = description_div.get_text(strip=True)
-
-                # 提取作者信息
-                author_parts = [] # 使用列表收集所有作者相关的价值内容
-                credits_div = soup.find('div', class_='credits')
-                if credits_div:
-                    logger.debug("找到 credits 块，开始提取所有内容作为作者信息")
-                    # 查找所有的 li.flex 元素
-                    for li in credits_div.find_all('li'):
-                        value_div = li.find('div', class_='value') # 查找 value 块
-                        if value_div:
-                            value = value_div.get_text(strip=True)
-                            if value: # 只添加非空的值
-                                author_parts.append(value)
-                                logger.debug(f"提取到内容作为作者信息: {value}")
-
-
-                # 将所有收集到的作者相关内容合并成一个字符串
-                combined_author = ", ".join(author_parts) if author_parts else ''
-                if combined_author:
-                    logger.debug(f"合并后的作者信息: {combined_author}")
-                else:
-                    logger.debug("在 credits 块内未找到任何内容")
-
-                logger.info("详情页解析完成")
-                return {'description': description, 'author': combined_author} # 返回描述和合并后的作者信息
-
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"抓取详情页失败 (尝试 {retry_num + 1}/{max_retries}): {str(e)}")
-                if retry_num < max_retries - 1:
-                    logger.info(f"等待 {retry_delay} 秒后重试...")
-                    time.sleep(retry_delay)
-                else:
-                    logger.error(f"抓取详情页在 {max_retries} 次尝试后仍然失败: {detail_url}")
-                    return None
-            except Exception as e:
-                 logger.error(f"解析详情页 {detail_url} 时出错: {str(e)}")
-                 return None
+        cached_details = self._get_cached_details(detail_url)
+        if cached_details is not None:
+            logger.debug("命中详情页缓存: %s", detail_url)
+            return cached_details
 
-    def _process_single_design(self, design: Dict) -> Optional[Dict]:
-        """处理单个设计作品：获取详情页数据和下载图片"""
         try:
-            # 获取详情页数据 (描述和作者)
-            details = self.get_design_details(design.get('detail_url'))
-            if details:
-                 if 'description' in details:
-                     design['description'] = details['description'] # 更新描述
-                     logger.debug(f"更新作品 {design.get('title','未知标题')} 描述")
-                 # 从详情页获取作者信息并更新
-                 if 'author' in details and details['author']:
-                     design['author'] = details['author'] # 更新作者信息
-                     logger.debug(f"更新作品 {design.get('title','未知标题')} 作者为: {design['author']}")
-                 else:
-                      logger.debug(f"作品 {design.get('title','未知标题')} 详情页未提取到作者信息")
-
-
-            # 下载图片并保存到文件
-            image_url = design.get('image_url')
-            logger.info(f"尝试下载图片: {image_url} 为作品: {design.get('title','未知标题')}")
-            image_path = self.download_image(image_url, self.images_dir)
-            design['image_path'] = image_path
-            if image_path:
-                 logger.debug(f"下载并保存作品 {design.get('title','未知标题')} 图片到: {image_path}")
+            logger.debug("开始抓取详情页数据: %s", detail_url)
+            response = self.session.get(detail_url, timeout=config.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            logger.debug("详情页请求成功，开始解析")
+            # 提取描述和作者信息，优先使用 selectolax
+            if HTMLParser is not None:
+                description, author_parts = _parse_details_selectolax(response.content)
             else:
-                 logger.warning(f"未能下载或保存作品 {design.get('title','未知标题')} 图片")
-
-            return design # 返回处理后的设计作品字典
+                description, author_parts = _parse_details_bs4(response.content)
 
-        except Exception as e:
-            logger.error(f"处理单个设计作品失败: {design.get('title','未知标题')} - {str(e)}", exc_info=True)
-            return None # 处理失败返回 None
+            # 将所有收集到的作者相关内容合并成一个字符串
+            combined_author = ", ".join(author_parts) if author_parts else ''
+            if combined_author:
+                logger.debug("合并后的作者信息: %s", combined_author)
+            else:
+                logger.debug("在 credits 块内未找到任何内容")
 
+            logger.debug("详情页解析完成")
+            details = {'description': description, 'author': combined_author} # 返回描述和合并后的作者信息
+            self._cache_details(detail_url, details)
+            return details
 
-    def search_designs(self, keyword: str = "", category_filter: str = "", category_name: str = "") -> List[Dict]:
-        """搜索设计作品，逐页处理并生成临时PDF"""
-        all_designs = [] # 新增一个列表用于存储所有作品数据
-        page = 1
-        max_retries = config.MAX_RETRIES
-        retry_delay = config.RETRY_DELAY # 秒 # 确保延时为1秒
+        except requests.exceptions.RequestException as e:
+            logger.error("抓取详情页在 %d 次重试后仍然失败: %s - %s", config.MAX_RETRIES, detail_url, e)
+            return None
+        except Exception as e:
+            logger.error("解析详情页 %s 时出错: %s", detail_url, e)
+            return None
 
-        temp_pdf_paths = [] # 初始化临时PDF文件路径列表
+    def _get_cached_details(self, detail_url: str) -> Optional[Dict]:
+        """读取未过期的详情页缓存"""
+        if self._details_cache is None or not detail_url:
+            return None
+        with self._details_cache_lock:
+            entry = self._details_cache.get(detail_url)
+        if entry and time.time() - entry['time'] < config.DETAILS_CACHE_DAYS * 86400:
+            return entry['details']
+        return None
 
-        while True:
+    def _cache_details(self, detail_url: str, details: Dict):
+        """缓存详情页解析结果"""
+        if self._details_cache is None:
+            return
+        with self._details_cache_lock:
+            self._details_cache[detail_url] = {'time': time.time(), 'details': details}
+
+    def _apply_design_details(self, design: Dict, details: Optional[Dict]):
+        """用详情页数据 (描述和作者) 更新作品"""
+        if details:
+             if 'description' in details:
+                 design['description'] = details['description'] # 更新描述
+                 logger.debug("更新作品 %s 描述", design.get('title','未知标题'))
+             # 从详情页获取作者信息并更新
+             if 'author' in details and details['author']:
+                 design['author'] = details['author'] # 更新作者信息
+                 logger.debug("更新作品 %s 作者为: %s", design.get('title','未知标题'), design['author'])
+             else:
+                  logger.debug("作品 %s 详情页未提取到作者信息", design.get('title','未知标题'))
+
+    def _apply_design_image(self, design: Dict, image_path: Optional[str]):
+        """记录作品图片的本地路径"""
+        design['image_path'] = image_path
+        if image_path:
+             logger.debug("下载并保存作品 %s 图片到: %s", design.get('title','未知标题'), image_path)
+        else:
+             logger.warning("未能下载或保存作品 %s 图片", design.get('title','未知标题'))
+
+    def _process_page_designs(self, page_designs: List[Dict]) -> List[Dict]:
+        """并发处理一页作品：每个作品的详情抓取和图片下载作为独立任务提交到线程池，互不等待，结果按原顺序返回"""
+        processed_page_designs = []
+        executor = self._io_executor
+        # 一次性提交本页所有请求，所有作品的详情页和图片同时下载
+        jobs = [
+            (
+                design,
+                executor.submit(self.get_design_details, design.get('detail_url')),
+                executor.submit(self.download_image, design.get('image_url'), self.images_dir)
+            )
+            for design in page_designs
+        ]
+
+        # 收集结果
+        for design, details_future, image_future in jobs:
             try:
-                logger.info(f"开始获取第 {page} 页数据 (分类: {category_filter or '所有'}) ") # 修改日志
+                self._apply_design_details(design, details_future.result())
+                self._apply_design_image(design, image_future.result())
+                processed_page_designs.append(design)
+                logger.debug("作品 %s 并行处理完成", design.get('title', '未知标题'))
+            except Exception as e:
+                # 单个作品的异常只在 DEBUG 级别输出堆栈
+                logger.error("作品 %s 并行处理过程中发生异常: %s", design.get('title', '未知标题'), e, exc_info=logger.isEnabledFor(logging.DEBUG))
 
-                # 构建请求参数
-                params = {
-                    'solr[filter][]': [], # 将空字符串改为列表，方便添加多个过滤条件
-                    'solr[page]': page
-                }
-                if keyword:
-                    params['solr[q]'] = keyword
+        return processed_page_designs
 
-                # 添加分类过滤条件
-                if category_filter:
-                    params['solr[filter][]'].append(category_filter)
 
-                # 构建完整的请求URL并记录
-                request = requests.Request('GET', self.base_url, params=params)
-                prepared_request = request.prepare()
-                full_url = prepared_request.url
-                logger.info(f"发送请求到: {full_url}")
+    def _fetch_search_page(self, keyword: str, category_filter: str, page: int) -> Dict:
+        """请求并解析一页搜索结果"""
+        logger.info("开始获取第 %d 页数据 (分类: %s) ", page, category_filter or '所有') # 修改日志
 
-                # 发送请求，增加重试机制
-                for retry_num in range(max_retries):
-                    try:
-                        response = requests.Session().send(prepared_request, timeout=config.REQUEST_TIMEOUT) # 使用Session发送预处理的请求
-                        response.raise_for_status() # 检查HTTP状态码
-                        logger.info("网络请求成功")
-                        # 记录响应状态码和部分内容
-                        logger.debug(f"收到完整响应 (状态码: {response.status_code}):\n{response.text}") # 记录完整的响应内容
-                        break # 请求成功，跳出重试循环
-                    except requests.exceptions.RequestException as e:
-                        logger.warning(f"网络请求失败 (尝试 {retry_num + 1}/{max_retries}): {str(e)}")
-                        if retry_num < max_retries - 1:
-                            logger.info(f"等待 {retry_delay} 秒后重试...")
-                            time.sleep(retry_delay)
-                        else:
-                            logger.error(f"网络请求在 {max_retries} 次尝试后仍然失败")
-                            raise # 重试次数用尽，抛出异常
-
-                logger.info("收到响应，开始解析内容")
-                data = response.json()
-
-                page_designs = []
-                # 检查 'result' 和 'docs' 键是否存在，并直接遍历 'docs' 列表
-                if 'result' in data and 'docs' in data['result'] and isinstance(data['result']['docs'], list):
-                    for doc in data['result']['docs']:
-                        try:
-                            # 打印原始doc对象，用于调试
-                            logger.debug(f"原始设计作品数据 (doc): {json.dumps(doc, ensure_ascii=False, indent=2)}")
-
-                            # 从API响应中提取必要信息
-                            title = doc.get('title', '').strip()
-                            category = doc.get('data', {}).get('category', '').strip()
-                            image_url = doc.get('image', {}).get('large', '').strip()
-                            author = doc.get('meta_second', '').strip()
-                            year = doc.get('data', {}).get('year', '').strip()
-                            detail_url_suffix = doc.get('url') # 获取详情页URL的后缀
-
-                            # 验证必要字段
-                            if not title or not image_url or not detail_url_suffix:
-                                logger.warning(f"跳过无效数据 (缺少标题、图片URL或详情页URL后缀): {json.dumps(doc, ensure_ascii=False)}")
-                                continue
+        # 构建请求参数
+        params = {
+            'solr[filter][]': [], # 将空字符串改为列表，方便添加多个过滤条件
+            'solr[page]': page
+        }
+        if keyword:
+            params['solr[q]'] = keyword
+        # 每页条数越大，列表请求次数越少；None 表示使用网站默认值
+        if config.API_RESULTS_PER_PAGE:
+            params['solr[resultsPerPage]'] = config.API_RESULTS_PER_PAGE
+
+        # 添加分类过滤条件
+        if category_filter:
+            params['solr[filter][]'].append(category_filter)
+
+        # 构建完整的请求URL并记录
+        request = requests.Request('GET', self.base_url, params=params)
+        prepared_request = self.session.prepare_request(request)
+        full_url = prepared_request.url
+        logger.info("发送请求到: %s", full_url)
+
+        # 发送请求，失败重试由 Session 的 adapter 处理，重试用尽后抛出异常
+        response = self.session.send(prepared_request, timeout=config.REQUEST_TIMEOUT)
+        response.raise_for_status() # 检查HTTP状态码
+        logger.info("网络请求成功")
+        # 只记录状态码和响应大小，不记录完整响应内容
+        logger.debug("收到响应 (状态码: %s, %d 字节)", response.status_code, len(response.content))
+
+        logger.info("收到响应，开始解析内容")
+        # 直接解析响应字节，不经过 str 解码
+        data = orjson.loads(response.content) if orjson is not None else response.json()
+        return data
+
+    def search_designs(self, keyword: str = "", category_filter: str = "", category_name: str = "") -> List[Dict]:
+        """搜索设计作品，逐页处理，返回所有采集到的作品；PDF 由 generate_designs_pdf 一次生成"""
+        all_designs = [] # 新增一个列表用于存储所有作品数据
+        page = 1
+        total_hits = None # API 返回的结果总数 (numFound)
+        docs_received = 0 # 已收到的原始结果条数（去重前）
 
-                            # 构建完整的详情页URL
-                            detail_url = f"{self.site_base_url}{detail_url_suffix}"
-                            logger.debug(f"构建的详情页完整URL: {detail_url}")
+        # 列表页由单独的线程预取，始终领先当前处理的页一页
+        listing_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        next_page_future = listing_executor.submit(self._fetch_search_page, keyword, category_filter, page)
 
-                            # 检查作品URL，如果已见过则跳过，否则添加到列表和seen_design_ids
-                            design_url = doc.get('url') # 使用url字段进行去重
-                            if design_url:
-                                if design_url in self.seen_design_ids:
-                                    logger.info(f"作品URL {design_url} 已见过，跳过: {title}")
+        csv_file = None # 分类 CSV 文件在第一页有数据时打开，整个采集过程只打开一次
+        try:
+            while True:
+                try:
+                    # 等待当前页列表返回，并立即开始请求下一页，下一页的网络等待与本页详情和图片抓取重叠
+                    data = next_page_future.result()
+
+                    # 根据 numFound 判断是否已是最后一页，已取完时不再请求下一页，省去一次返回空页的请求
+                    result = data.get('result', {})
+                    if total_hits is None and isinstance(result.get('numFound'), int):
+                        total_hits = result['numFound']
+                        logger.info("共有 %d 个结果", total_hits)
+                    if isinstance(result.get('docs'), list):
+                        docs_received += len(result['docs'])
+                    last_page = total_hits is not None and docs_received >= total_hits
+                    if not last_page:
+                        next_page_future = listing_executor.submit(self._fetch_search_page, keyword, category_filter, page + 1)
+
+                    page_designs = []
+                    # 检查 'result' 和 'docs' 键是否存在，并直接遍历 'docs' 列表
+                    if 'result' in data and 'docs' in data['result'] and isinstance(data['result']['docs'], list):
+                        for doc in data['result']['docs']:
+                            try:
+                                # 打印原始doc对象，用于调试；序列化开销较大，只在 DEBUG 级别下执行
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug("原始设计作品数据 (doc): %s", _dump_doc(doc))
+
+                                # 从API响应中提取必要信息
+                                title = doc.get('title', '').strip()
+                                category = doc.get('data', {}).get('category', '').strip()
+                                image_url = doc.get('image', {}).get('large', '').strip()
+                                author = doc.get('meta_second', '').strip()
+                                year = doc.get('data', {}).get('year', '').strip()
+                                detail_url_suffix = doc.get('url') # 获取详情页URL的后缀
+
+                                # 验证必要字段
+                                if not title or not image_url or not detail_url_suffix:
+                                    logger.warning("跳过无效数据 (缺少标题、图片URL或详情页URL后缀): %s", _dump_doc(doc))
+                                    continue
+
+                                # 构建完整的详情页URL
+                                detail_url = f"{self.site_base_url}{detail_url_suffix}"
+                                logger.debug("构建的详情页完整URL: %s", detail_url)
+
+                                # 检查作品URL，如果已见过则跳过，否则添加到列表和seen_design_ids
+                                # 详情页URL后缀在上面已校验过，这里一定存在
+                                design_url = detail_url_suffix # 使用url字段进行去重
+                                design_key = _url_key(design_url)
+                                if design_key in self.seen_design_ids:
+                                    logger.debug("作品URL %s 已见过，跳过: %s", design_url, title)
                                     continue # 跳过已见过的作品
-                                else:
-                                    self.seen_design_ids.add(design_url)
-                                    design = {
-                                        'title': title,
-                                        'description': '', # 描述先留空，后面抓取详情页
-                                        'type': category,
-                                        'image_url': image_url,
-                                        'author': author, # 作者先用API返回的，后面详情页更新
-                                        'date': year,
-                                        'detail_url': detail_url # 保留详情页URL，可能有用
-                                    }
-                                    page_designs.append(design)
-                                    logger.info(f"解析到设计作品: {design['title']} (URL: {design_url})")
-                            else:
-                                logger.warning(f"作品缺少URL字段，无法去重: {title}")
-                                # 如果没有URL，暂时还是添加到列表，但无法保证去重
+                                self.seen_design_ids.add(design_key)
+
+                                # 描述和作者只在 _process_page_designs 中抓取详情页时填充一次
                                 design = {
                                     'title': title,
                                     'description': '', # 描述先留空，后面抓取详情页
@@ -253,171 +456,232 @@ class RedDotCrawler:
                                     'detail_url': detail_url # 保留详情页URL，可能有用
                                 }
                                 page_designs.append(design)
-                                logger.info(f"解析到设计作品 (无URL): {design.get('title', '未知标题')}")
+                                logger.debug("解析到设计作品: %s (URL: %s)", design['title'], design_url)
 
-                        except Exception as e:
-                            logger.error(f"处理单个设计作品时出错: {str(e)}", exc_info=True)
-                            continue
+                            except Exception as e:
+                                logger.error("处理单个设计作品时出错: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+                                continue
 
-                if not page_designs:
-                    logger.info(f"第 {page} 页去重后没有作品，停止获取") # 修改日志信息
-                    break
+                    if not page_designs:
+                        logger.info("第 %d 页去重后没有作品，停止获取", page) # 修改日志信息
+                        break
 
-                logger.info(f"成功获取并处理第 {page} 页的 {len(page_designs)} 个设计作品（去重后），开始并行处理详情和图片下载...") # 修改日志信息
-
-                # 使用线程池并行处理每个作品的详情抓取和图片下载
-                processed_page_designs = []
-                with concurrent.futures.ThreadPoolExecutor(max_workers=config.NUM_THREADS) as executor:
-                    # 提交任务到线程池
-                    future_to_design = {executor.submit(self._process_single_design, design): design for design in page_designs}
-
-                    # 收集结果
-                    for future in concurrent.futures.as_completed(future_to_design):
-                        original_design = future_to_design[future]
-                        try:
-                            processed_design = future.result()
-                            if processed_design:
-                                processed_page_designs.append(processed_design)
-                                logger.debug(f"作品 {processed_design.get('title', '未知标题')} 并行处理完成")
-                            else:
-                                logger.warning(f"作品 {original_design.get('title', '未知标题')} 并行处理失败")
-                        except Exception as e:
-                            logger.error(f"作品 {original_design.get('title', '未知标题')} 并行处理过程中发生异常: {str(e)}", exc_info=True)
-
-                logger.info(f"第 {page} 页并行处理完成，成功处理 {len(processed_page_designs)} 个作品。") # Added log
-
-
-                # 将当前页处理后的作品添加到总列表
-                all_designs.extend(processed_page_designs)
-
-                # 在每一页数据获取和处理完成后保存CSV
-                logger.info(f"开始保存 {category_name} 分类的 CSV 文件 (当前已采集 {len(all_designs)} 条)... ")
-                # 注意：这里需要确保save_designs_to_csv支持追加模式，或者每次都重写
-                self.save_designs_to_csv(processed_page_designs, self.output_dir, category_name)
-
-                # 将当前页处理后的作品生成临时PDF
-                logger.info(f"准备为第 {page} 页生成临时PDF...")
-                # create_temp_page_pdf 方法需要在 PdfGenerator 中实现，接收当前页的设计列表和页码
-                temp_pdf_path = self.pdf_generator.create_temp_page_pdf(processed_page_designs, page)
-                if temp_pdf_path:
-                    temp_pdf_paths.append(temp_pdf_path)
-                    logger.info(f"生成第 {page} 页临时PDF: {temp_pdf_path}")
-                else:
-                    logger.warning(f"生成第 {page} 页临时PDF失败")
-
-                page += 1 # 页数增加
+                    logger.info("成功获取并处理第 %d 页的 %d 个设计作品（去重后），开始并行处理详情和图片下载...", page, len(page_designs)) # 修改日志信息
 
-            except Exception as e:
-                logger.error(f"处理第 {page} 页数据时发生异常: {str(e)}", exc_info=True)
-                break
+                    # 使用线程池并发抓取本页所有作品的详情和图片
+                    processed_page_designs = self._process_page_designs(page_designs)
 
-        logger.info(f"数据获取完成，总共获取到 {len(all_designs)} 个作品。")
-        # 返回所有采集到的作品数据和临时PDF文件路径列表
-        return all_designs, temp_pdf_paths
+                    logger.info("第 %d 页并行处理完成，成功处理 %d 个作品。", page, len(processed_page_designs)) # Added log
 
-    def download_image(self, image_url: str, output_dir: str) -> Optional[str]:
-        """下载图片并保存到指定目录，根据 Content-Type 确定文件后缀，增加重试机制"""
-        max_retries = config.MAX_RETRIES
-        retry_delay = config.RETRY_DELAY # 秒
 
+                    # 将当前页处理后的作品添加到总列表
+                    all_designs.extend(processed_page_designs)
+
+                    # 在每一页数据获取和处理完成后写入CSV：文件只在第一页打开一次，之后每页追加并刷新到磁盘
+                    if processed_page_designs:
+                        if csv_file is None:
+                            csv_file, csv_writer = self._open_csv(self.output_dir, category_name)
+                        csv_writer.writerows(processed_page_designs)
+                        csv_file.flush() # 中断时已采集的数据不丢失
+                        logger.info("已写入 %s 分类的 CSV 文件 (当前已采集 %d 条)", category_name, len(all_designs))
+
+                    if last_page:
+                        logger.info("已收到全部 %d 个结果，第 %d 页为最后一页", total_hits, page)
+                        break
+
+                    page += 1 # 页数增加
+
+                except Exception as e:
+                    logger.error("处理第 %d 页数据时发生异常: %s", page, e, exc_info=True)
+                    break
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+            # 最后一次预取的页不再需要：尚未开始的请求直接取消，已在进行中的请求等待其结束，
+            # 返回后不会再有请求使用调用方的 Session（只有一个工作线程和一个待处理任务，
+            # 取消该任务等同于 Python 3.9+ 的 shutdown(cancel_futures=True)，同时兼容 3.8）
+            next_page_future.cancel()
+            listing_executor.shutdown(wait=True)
+        logger.info("数据获取完成，总共获取到 %d 个作品。", len(all_designs))
+
+        return all_designs
+
+    def download_image(self, image_url: str, output_dir: str) -> Optional[str]:
+        """下载图片并保存到指定目录，根据 Content-Type 确定文件后缀，失败重试由 Session 负责"""
         if not image_url:
             logger.warning("图片URL为空，跳过下载")
             return None
 
-        for retry_num in range(max_retries):
-            try:
-                logger.info(f"开始下载图片 (尝试 {retry_num + 1}/{max_retries}): {image_url}")
-                
-                response = requests.get(image_url, timeout=config.REQUEST_TIMEOUT)
+        try:
+            logger.debug("开始下载图片: %s", image_url)
+
+            # 生成文件名，可以使用 URL 的哈希值或者结合部分 URL 和扩展名
+            # 使用 URL 的哈希值可以避免文件名过长或包含特殊字符
+            url_hash = hashlib.blake2b(image_url.encode('utf-8'), digest_size=16).hexdigest()
+
+            # 之前下载过的图片带上 ETag / Last-Modified 发送条件请求，未变化时服务器返回 304 且不带响应体
+            meta_path = os.path.join(output_dir, url_hash + '.meta.json')
+            cached_path = None
+            headers = {}
+            meta = _load_image_meta(meta_path)
+            if meta is None or not os.path.exists(os.path.join(output_dir, meta['file'])):
+                # 旁路文件缺失（例如旧版本下载的图片）时查找磁盘上已有的文件，找到后不再发送请求
+                meta = self._adopt_existing_image(image_url, output_dir, url_hash)
+            if meta is not None:
+                cached_path = os.path.join(output_dir, meta['file'])
+                # 默认直接复用已下载的图片，不发送任何请求
+                if not config.IMAGE_REVALIDATE:
+                    logger.debug("图片已下载，跳过: %s", cached_path)
+                    return cached_path
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+
+            # 流式下载，响应体不整体读入内存
+            with self.session.get(image_url, headers=headers, timeout=config.REQUEST_TIMEOUT, stream=True) as response:
+                if response.status_code == 304 and cached_path:
+                    logger.debug("图片未变化，使用已下载的文件: %s", cached_path)
+                    return cached_path
                 response.raise_for_status()
-                
-                # 根据 Content-Type 确定文件后缀
-                content_type = response.headers.get('Content-Type', '')
-                if not content_type or 'image' not in content_type:
-                    logger.warning(f"URL {image_url} 返回的不是图片类型 ({content_type})，跳过保存")
+
+                # 根据 Content-Type 确定文件后缀，去掉 charset 等参数
+                content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+                if not content_type.startswith('image/'):
+                    logger.warning("URL %s 返回的不是图片类型 (%s)，跳过保存", image_url, content_type)
                     return None
 
-                # 使用 mimetypes 获取标准的文件扩展名
-                extension = mimetypes.guess_extension(content_type)
+                # 读取响应体之前按 Content-Length 拒绝过大的图片
+                content_length = int(response.headers.get('Content-Length') or 0)
+                if content_length > config.MAX_IMAGE_BYTES:
+                    logger.warning("图片过大 (%d 字节)，跳过下载: %s", content_length, image_url)
+                    return None
+
+                # 查表获取标准的文件扩展名
+                extension = _EXT_BY_CT.get(content_type)
                 if not extension:
-                    # 如果 mimetypes 无法猜测，尝试从 content_type 中直接获取子类型作为扩展名
-                    extension = '.' + content_type.split('/')[-1] if '/' in content_type else '.jpg' # 默认为 .jpg
-                    logger.warning(f"无法通过 mimetypes 确定扩展名，使用 Content-Type 的子类型: {extension}")
+                    # 表中没有的类型，直接使用 Content-Type 的子类型作为扩展名
+                    extension = '.' + content_type.split('/', 1)[1]
+                    logger.warning("未知的图片类型，使用 Content-Type 的子类型: %s", extension)
 
-                # 生成文件名，可以使用 URL 的哈希值或者结合部分 URL 和扩展名
-                # 使用 URL 的哈希值可以避免文件名过长或包含特殊字符
-                url_hash = hashlib.md5(image_url.encode('utf-8')).hexdigest()
                 image_filename = f"{url_hash}{extension}"
 
                 image_path = os.path.join(output_dir, image_filename)
 
-                # 如果文件已存在且大小一致，跳过下载 (可选优化)
-                # if os.path.exists(image_path) and os.path.getsize(image_path) == len(response.content):
-                #     logger.info(f"图片已存在且一致，跳过下载: {image_path}")
-                #     return image_path
-
-                # 保存图片到文件
-                with open(image_path, 'wb') as f:
-                    f.write(response.content)
-                
-                logger.info("图片下载成功")
-                return image_path
-
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"下载图片失败 (尝试 {retry_num + 1}/{max_retries}): {str(e)}")
-                if retry_num < max_retries - 1:
-                    logger.info(f"等待 {retry_delay} 秒后重试...")
-                    time.sleep(retry_delay)
-                else:
-                    logger.error(f"下载图片在 {max_retries} 次尝试后仍然失败: {image_url}")
-                    return None
+                # 分块写入临时文件再重命名，避免中断时留下不完整的图片；写入的同时计算内容摘要
+                digest = hashlib.blake2b(digest_size=16)
+                with open(image_path + '.part', 'wb', buffering=1024 * 1024) as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        digest.update(chunk)
+                        f.write(chunk)
+                os.replace(image_path + '.part', image_path)
+                self._link_duplicate_image(digest.digest(), image_path)
+
+                # 记录校验信息，下次运行时用于条件请求
+                _save_image_meta(meta_path, {
+                    'file': image_filename,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                })
+
+            logger.debug("图片下载成功")
+            return image_path
+
+        except requests.exceptions.RequestException as e:
+            logger.error("下载图片在 %d 次重试后仍然失败: %s - %s", config.MAX_RETRIES, image_url, e)
+            return None
 
-            except Exception as e:
-                 logger.error(f"保存图片文件时出错: {str(e)}", exc_info=True)
-                 return None
+        except Exception as e:
+            logger.error("保存图片文件时出错: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return None
 
+    def _adopt_existing_image(self, image_url: str, output_dir: str, url_hash: str) -> Optional[Dict]:
+        """查找没有旁路文件的已下载图片（图片目录和旧版本的分类图片目录），
+        找到时链接到图片目录并补写 .meta.json，返回新的旁路信息
+
+        旧版本以 URL 的 md5 命名图片（早期版本不写 .meta.json），同样按 md5 文件名查找；
+        旧文件保留不动，旧的 CSV 中记录的图片路径仍然有效
+        """
+        legacy_hash = hashlib.md5(image_url.encode('utf-8')).hexdigest()
+        candidates = [(directory, name_hash)
+                      for directory in [output_dir] + self._legacy_images_dirs
+                      for name_hash in (url_hash, legacy_hash)]
+        for directory, name_hash in candidates:
+            found = _probe_image(directory, name_hash)
+            if found is None:
+                continue
+            existing_path, existing_meta = found
+            image_filename = url_hash + os.path.splitext(existing_path)[1]
+            image_path = os.path.join(output_dir, image_filename)
+            try:
+                if not os.path.exists(image_path):
+                    # 不支持硬链接时复制
+                    try:
+                        os.link(existing_path, image_path)
+                    except OSError:
+                        shutil.copy2(existing_path, image_path)
+                meta = {
+                    'file': image_filename,
+                    'etag': (existing_meta or {}).get('etag'),
+                    'last_modified': (existing_meta or {}).get('last_modified')
+                }
+                _save_image_meta(os.path.join(output_dir, url_hash + '.meta.json'), meta)
+            except OSError as e:
+                logger.warning("沿用已下载的图片失败，将重新下载: %s - %s", existing_path, e)
+                return None
+            logger.debug("沿用已下载的图片: %s", existing_path)
+            return meta
         return None
 
-    def save_designs_to_csv(self, designs: List[Dict], output_dir: str, category_name: str):
-        """将采集到的设计作品数据保存为 CSV 文件，支持追加数据"""
-        if not designs:
-            logger.warning(f"没有 {category_name} 分类的作品数据可保存为 CSV")
+    def _link_duplicate_image(self, digest: bytes, image_path: str):
+        """不同 URL 下载到相同内容的图片时，改为指向首个文件的硬链接，节省磁盘空间"""
+        canonical_path = self._image_digests.setdefault(digest, image_path)
+        if canonical_path == image_path:
             return
-            
+        try:
+            os.link(canonical_path, image_path + '.link')
+            os.replace(image_path + '.link', image_path)
+            logger.debug("图片内容与 %s 相同，已改为硬链接: %s", canonical_path, image_path)
+        except OSError as e:
+            # 文件系统不支持硬链接时保留独立文件
+            logger.debug("创建硬链接失败，保留原文件 %s: %s", image_path, e)
+
+    def _open_csv(self, output_dir: str, category_name: str):
+        """以追加模式打开分类 CSV 文件，新文件先写入表头，返回文件对象和 DictWriter"""
         csv_filename = f"reddot_designs_{category_name}.csv"
         csv_filepath = os.path.join(output_dir, csv_filename)
-        
-        # 确定 CSV 文件的字段名
-        fieldnames = list(designs[0].keys())
-        core_fields = ['title', 'description', 'type', 'image_url', 'image_path', 'author', 'date', 'detail_url']
-        for field in core_fields:
-            if field not in fieldnames:
-                 fieldnames.append(field)
-
-        # 检查文件是否存在，如果存在则以追加模式打开，否则以写入模式打开并写入表头
-        file_exists = os.path.exists(csv_filepath)
-        mode = 'a' if file_exists else 'w'
 
-        try:
-            with open(csv_filepath, mode, newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        # 检查文件是否存在，不存在时需要写入表头
+        file_exists = os.path.exists(csv_filepath)
+        csvfile = open(csv_filepath, 'a', newline='', encoding='utf-8', buffering=1024 * 1024)
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        if not file_exists:
+            writer.writeheader()
+        logger.info("打开 CSV 文件: %s", csv_filepath)
+        return csvfile, writer
 
-                if not file_exists:  
-                    writer.writeheader() # 如果文件不存在，写入表头
+    def save_designs_to_csv(self, designs: List[Dict], output_dir: str, category_name: str):
+        """将采集到的设计作品数据保存为 CSV 文件，支持追加数据"""
+        if not designs:
+            logger.warning("没有 %s 分类的作品数据可保存为 CSV", category_name)
+            return
 
+        try:
+            csvfile, writer = self._open_csv(output_dir, category_name)
+            with csvfile:
                 writer.writerows(designs) # 写入数据行
-            logger.info(f"数据已保存到 CSV 文件: {csv_filepath}")
+            logger.info("数据已保存到 CSV 文件: %s", csvfile.name)
         except Exception as e:
-             logger.error(f"保存 CSV 文件失败: {str(e)}", exc_info=True)
+             logger.error("保存 CSV 文件失败: %s", e, exc_info=True)
 
     def generate_designs_pdf(self, designs: List[Dict], output_filename: str, output_dir: str):
         """使用 PdfGenerator 生成包含作品数据的 PDF 文件"""
         if not designs:
-            logger.warning(f"没有作品数据可生成 PDF")
+            logger.warning("没有作品数据可生成 PDF")
             return
             
         total_designs_count = len(designs)
-        logger.info(f"开始生成包含 {total_designs_count} 个作品的 PDF")
+        logger.info("开始生成包含 %d 个作品的 PDF", total_designs_count)
 
         # 调用 PdfGenerator 的方法来生成 PDF
         try:
@@ -425,168 +689,64 @@ class RedDotCrawler:
             # 这个方法需要在 PdfGenerator 类中实现
             final_pdf_path = self.pdf_generator.generate_full_pdf(designs, output_filename)
             if final_pdf_path:
-                logger.info(f"最终 PDF 文件已生成: {final_pdf_path}")
+                logger.info("最终 PDF 文件已生成: %s", final_pdf_path)
             else:
                 logger.warning("生成最终 PDF 文件失败")
         except AttributeError:
              logger.error("PdfGenerator 类缺少 generate_full_pdf 方法，无法生成 PDF")
         except Exception as e:
-             logger.error(f"生成 PDF 时发生异常: {str(e)}", exc_info=True)
-
-    # 测试相关方法
-    def test_search_designs(self):
-        """测试设计作品搜索功能"""
-        try:
-            # 测试搜索
-            result = self.search_designs("product-design", 1)
-            
-            # 验证结果
-            assert result is not None, "搜索结果不应为None"
-            assert isinstance(result, list), "结果应该是列表"
-            assert len(result) > 0, "应该至少有一个结果"
-            
-            # 验证结果格式
-            design = result[0]
-            assert 'title' in design, "结果应包含标题"
-            assert 'designer' in design, "结果应包含设计师"
-            assert 'description' in design, "结果应包含描述"
-            assert 'image_url' in design, "结果应包含图片URL"
-            assert 'detail_url' in design, "结果应包含详情页URL"
-            
-            logger.info("设计作品搜索测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"设计作品搜索测试失败: {str(e)}", exc_info=True)
-            return False
-
-    def test_process_single_design(self):
-        """测试单个设计作品处理功能"""
-        try:
-            # 创建测试数据
-            test_design = {
-                'title': 'Test Design',
-                'designer': 'Test Designer',
-                'description': 'Test Description',
-                'image_url': 'https://www.red-dot.org/fileadmin/bilder/Kategorien_PD/PD_2023/PD_2023_1.jpg',
-                'detail_url': 'https://www.red-dot.org/project/12345'
-            }
-            
-            # 测试处理
-            result = self._process_single_design(test_design)
-            
-            # 验证结果
-            assert result is not None, "处理结果不应为None"
-            assert isinstance(result, dict), "结果应该是字典"
-            assert 'title' in result, "结果应包含标题"
-            assert 'designer' in result, "结果应包含设计师"
-            assert 'description' in result, "结果应包含描述"
-            assert 'image_url' in result, "结果应包含图片URL"
-            assert 'detail_url' in result, "结果应包含详情页URL"
-            
-            logger.info("单个设计作品处理测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"单个设计作品处理测试失败: {str(e)}", exc_info=True)
-            return False
-
-    def test_parse_design_details(self):
-        """测试设计作品详情解析功能"""
-        try:
-            # 创建测试数据
-            test_design = {
-                'title': 'Test Design',
-                'designer': 'Test Designer',
-                'description': 'Test Description',
-                'image_url': 'https://www.red-dot.org/fileadmin/bilder/Kategorien_PD/PD_2023/PD_2023_1.jpg',
-                'detail_url': 'https://www.red-dot.org/de/project/jiyue-67940'
-            }
-            
-            # 测试解析
-            result = self._parse_design_details(test_design)
-            
-            # 验证结果
-            assert result is not None, "解析结果不应为None"
-            assert isinstance(result, dict), "结果应该是字典"
-            assert 'title' in result, "结果应包含标题"
-            assert 'designer' in result, "结果应包含设计师"
-            assert 'description' in result, "结果应包含描述"
-            assert 'image_url' in result, "结果应包含图片URL"
-            assert 'detail_url' in result, "结果应包含详情页URL"
-            
-            logger.info("设计作品详情解析测试通过")
-            return True
-            
-        except Exception as e:
-            logger.error(f"设计作品详情解析测试失败: {str(e)}", exc_info=True)
-            return False
-
-    def run_all_tests(self):
-        """运行所有测试"""
-        test_results = {
-            'search_designs': self.test_search_designs(),
-            'process_single_design': self.test_process_single_design(),
-            'parse_design_details': self.test_parse_design_details()
-        }
-        
-        # 打印测试结果
-        logger.info("测试结果汇总:")
-        for test_name, result in test_results.items():
-            status = "通过" if result else "失败"
-            logger.info(f"{test_name}: {status}")
-        
-        return all(test_results.values())
+             logger.error("生成 PDF 时发生异常: %s", e, exc_info=True)
 
 def main():
     # 从配置中读取分类
     categories = config.CATEGORIES
 
-    for category_name, category_filter in categories.items():
-        logger.info(f"\n--- 开始采集分类: {category_name} (过滤参数: {category_filter}) ---")
-
-        category_output_dir = os.path.join(config.OUTPUT_DIR, category_name)
-        if not os.path.exists(category_output_dir):
-             os.makedirs(category_output_dir)
-             logger.info(f"创建分类输出目录: {category_output_dir}")
+    # 所有分类共用一个图片目录和图片内容摘要表：跨分类重复的图片只下载一次，内容相同的图片改为硬链接
+    images_dir = os.path.join(config.OUTPUT_DIR, "images")
+    image_digests: Dict[bytes, str] = {}
+
+    # 所有分类共用一个 Session，连接池和已建立的 keep-alive 连接在整个采集过程中复用
+    with create_session(config.OUTPUT_DIR) as session:
+        for category_name, category_filter in categories.items():
+            logger.info("\n--- 开始采集分类: %s (过滤参数: %s) ---", category_name, category_filter)
+
+            category_output_dir = os.path.join(config.OUTPUT_DIR, category_name)
+            if not os.path.exists(category_output_dir):
+                 os.makedirs(category_output_dir)
+                 logger.info("创建分类输出目录: %s", category_output_dir)
+
+            # 为当前分类创建一个新的爬虫实例，共用整个采集过程的 Session、图片目录和图片摘要表
+            crawler = RedDotCrawler(
+                base_url=config.BASE_URL,
+                output_dir=category_output_dir,
+                site_base_url=config.SITE_BASE_URL,
+                session=session,
+                images_dir=images_dir,
+                image_digests=image_digests
+            )
+
+            # 搜索设计作品，采集所有数据
+            all_designs = crawler.search_designs(keyword="", category_filter=category_filter, category_name=category_name)
+
+            if all_designs:
+                # 获取总作品数量
+                total_designs_count = len(all_designs)
+                logger.info("总共获取到 %d 个设计作品", total_designs_count)
+
+                # 生成 PDF 文件，调用新封装的方法
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_filename = f"reddot_designs_{category_name}_{timestamp}.pdf"
+                logger.info("开始生成 %s 分类的 PDF 文件: %s...", category_name, output_filename)
+                crawler.generate_designs_pdf(all_designs, output_filename, category_output_dir)
+                logger.info("PDF 文件生成完成。")
 
-        # 为当前分类创建一个新的爬虫实例
-        crawler = RedDotCrawler(
-            base_url=config.BASE_URL,
-            output_dir=category_output_dir,
-            site_base_url=config.SITE_BASE_URL
-        )
-
-        # 搜索设计作品，采集所有数据，并生成临时PDF
-        all_designs, temp_pdf_paths = crawler.search_designs(keyword="", category_filter=category_filter, category_name=category_name)
-
-        if all_designs:
-            # 获取总作品数量
-            total_designs_count = len(all_designs)
-            logger.info(f"总共获取到 {total_designs_count} 个设计作品")
-
-            # 生成 PDF 文件，调用新封装的方法
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"reddot_designs_{category_name}_{timestamp}.pdf"
-            logger.info(f"开始生成 {category_name} 分类的 PDF 文件: {output_filename}...")
-            crawler.generate_designs_pdf(all_designs, output_filename, category_output_dir)
-            logger.info(f"PDF 文件生成完成。")
-
-        else:
-            logger.warning(f"未找到 {category_name} 分类的设计作品")
+            else:
+                logger.warning("未找到 %s 分类的设计作品", category_name)
 
-        logger.info(f"--- 完成采集分类: {category_name} ---\n")
+            crawler.close()
+            logger.info("--- 完成采集分类: %s ---\n", category_name)
 
     logger.info("所有分类采集任务完成")
 
 if __name__ == "__main__":
-    # 创建测试实例
-    test_crawler = RedDotCrawler()
-    
-    # 运行所有测试
-    success = test_crawler.run_all_tests()
-    
-    # 设置退出码
-    import sys
-    sys.exit(0 if success else 1)
-    
\ No newline at end of file
+    main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import threading
+import http.server
+from io import BytesIO
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from PIL import Image as PILImage
+
+# 从项目根目录导入被测模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_jpeg(size=(64, 48), color='red') -> bytes:
+    """生成测试用的 JPEG 图片数据"""
+    buffer = BytesIO()
+    PILImage.new('RGB', size, color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+DETAIL_HTML = (
+    b'<html><body>'
+    b'<div class="description text">Desc text</div>'
+    b'<div class="credits"><ul><li><div class="value">Alice</div></li><li><div class="value">Bob</div></li></ul></div>'
+    b'</body></html>'
+)
+
+class LocalSite:
+    """本地模拟的红点网站：搜索 API、详情页和图片，记录收到的所有请求路径"""
+
+    def __init__(self):
+        self.requests = []
+        self.pages = 2 # 有数据的页数
+        self.per_page = 3 # 每页作品数
+        self.num_found = True # 搜索结果是否带 numFound
+        self.image = make_jpeg()
+        self.image_etag = '"v1"'
+        self.request_headers = [] # 每个请求的请求头，与 requests 一一对应
+        self.url = None
+
+    def api_pages(self):
+        """收到的搜索 API 请求的页码"""
+        return [int(parse_qs(urlparse(path).query)['solr[page]'][0]) for path in self.requests if path.startswith('/api')]
+
+    def image_requests(self):
+        return [path for path in self.requests if path.startswith('/img')]
+
+    def detail_requests(self):
+        return [path for path in self.requests if path.startswith('/detail')]
+
+    def handle(self, handler):
+        self.requests.append(handler.path)
+        self.request_headers.append(dict(handler.headers))
+        parsed = urlparse(handler.path)
+        query = parse_qs(parsed.query)
+        if parsed.path == '/api':
+            page = int(query['solr[page]'][0])
+            docs = [] if page > self.pages else [
+                {
+                    'title': f'T{page}-{i}',
+                    'url': f'/detail/{page}-{i}',
+                    'image': {'large': f'{self.url}/img/{page}-{i}'},
+                    'meta_second': 'api author',
+                    'data': {'category': 'c', 'year': '2024'}
+                }
+                for i in range(self.per_page)
+            ]
+            result = {'docs': docs}
+            if self.num_found:
+                result['numFound'] = self.pages * self.per_page
+            return 200, 'application/json', json.dumps({'result': result}).encode()
+        if parsed.path.startswith('/detail'):
+            return 200, 'text/html', DETAIL_HTML
+        if parsed.path.startswith('/img'):
+            if handler.headers.get('If-None-Match') == self.image_etag:
+                return 304, 'image/jpeg', b''
+            return 200, query.get('ct', ['image/jpeg'])[0], self.image
+        return 404, 'text/plain', b'not found'
+
+@pytest.fixture
+def site():
+    """在本地线程中启动模拟网站，测试不访问外部网络"""
+    local_site = LocalSite()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            status, content_type, body = local_site.handle(self)
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            if self.path.startswith('/img'):
+                self.send_header('ETag', local_site.image_etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    local_site.url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield local_site
+    server.shutdown()
+    server.server_close()
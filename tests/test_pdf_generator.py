@@ -0,0 +1,194 @@
+import os
+import re
+import sys
+import logging
+from io import BytesIO
+
+# 从项目根目录导入被测模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PIL import Image as PILImage
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from PyPDF2 import PdfReader
+
+import config
+from pdf_generator import PdfGenerator, _fast_image_size
+
+logger = logging.getLogger(__name__)
+
+@pytest.fixture
+def generator(tmp_path):
+    """每个测试使用输出到临时目录的新 PdfGenerator 实例"""
+    return PdfGenerator(output_dir=str(tmp_path))
+
+def _create_test_pdf(generator: PdfGenerator, filename: str) -> str:
+    """创建测试用的单页PDF文件，返回完整路径"""
+    output_path = os.path.join(generator.temp_dir, filename)
+    packet = BytesIO()
+    can = canvas.Canvas(packet, pagesize=A4)
+    can.drawString(100, 750, "Test Page")
+    can.showPage()
+    can.save()
+
+    with open(output_path, 'wb') as f:
+        f.write(packet.getvalue())
+
+    logger.info("创建测试PDF文件: %s", output_path)
+    return output_path
+
+def _create_test_image(directory, filename: str = 'test.jpg', size=(800, 600), image_format: str = 'JPEG') -> str:
+    """创建测试用的本地图片文件，返回完整路径"""
+    path = os.path.join(str(directory), filename)
+    PILImage.new('RGB', size, 'blue').save(path, image_format)
+    return path
+
+def _page_numbers(pdf_path: str):
+    """提取每页右下角页码中的 (页码, 总页数)"""
+    numbers = []
+    for page in PdfReader(pdf_path).pages:
+        found = re.findall(r'(\d+)\D{0,4}/\D{0,4}(\d+)', page.extract_text() or '')
+        numbers.append(tuple(map(int, found[-1])) if found else None)
+    return numbers
+
+def test_pdf_styles(generator):
+    """测试PDF样式"""
+    test_design = {
+        'title': '测试作品标题',
+        'type': '产品设计',
+        'author': '测试作者',
+        'date': '2024',
+        'description': '这是一个测试作品描述。'
+    }
+
+    result = generator.generate_full_pdf([test_design], "test_styles.pdf")
+
+    assert result is not None, "PDF生成结果不应为None"
+    assert os.path.exists(result), "生成的PDF文件应该存在"
+
+def test_merge_pdfs(generator):
+    """测试PDF合并功能"""
+    test_files = [_create_test_pdf(generator, f"test_{i}.pdf") for i in range(3)]
+    for filepath in test_files:
+        assert os.path.exists(filepath), f"测试文件不存在: {filepath}"
+
+    result = generator.merge_pdfs(test_files, "test_merged.pdf", 3)
+
+    assert result is not None, "合并结果不应为None"
+    assert os.path.exists(result), "合并后的文件应该存在"
+    assert len(PdfReader(result).pages) == 3, "应该有3页（3个文件，每个1页）"
+
+def test_create_temp_page_pdf(generator, tmp_path):
+    """测试临时PDF页面创建功能，使用本地图片"""
+    test_designs = [
+        {
+            'title': 'Test Design 1',
+            'designer': 'Test Designer 1',
+            'description': 'Test Description 1',
+            'type': 'Test Type 1',
+            'author': 'Test Author 1',
+            'date': '2024',
+            'image_path': _create_test_image(tmp_path)
+        }
+    ]
+
+    result = generator.create_temp_page_pdf(test_designs, 1)
+
+    assert result is not None, "临时PDF创建结果不应为None"
+    assert os.path.exists(result), "临时PDF文件应该存在"
+
+def test_download_image(generator, site):
+    """测试图片下载功能：从本地模拟网站下载到临时输出目录的图片缓存，再次下载时命中缓存不发送请求"""
+    test_url = f"{site.url}/img/1-0"
+
+    result = generator._download_image(test_url)
+
+    assert result is not None, "下载结果不应为None"
+    assert os.path.exists(result), "下载的文件应该存在"
+    assert os.path.dirname(result) == generator.image_cache_dir
+    assert generator._download_image(test_url) == result
+    assert len(site.image_requests()) == 1
+
+def test_download_image_ignores_truncated_meta(generator, site):
+    """截断的 .meta.json 视为未缓存，重新下载而不是一直失败"""
+    test_url = f"{site.url}/img/1-0"
+    result = generator._download_image(test_url)
+    meta_path = os.path.splitext(result)[0] + '.meta.json'
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        f.write('{"file": "ab')
+
+    assert generator._download_image(test_url) == result
+    assert len(site.image_requests()) == 2
+
+def test_download_image_revalidates_with_etag(generator, site, monkeypatch):
+    """开启 IMAGE_REVALIDATE 时带上缓存的 ETag 发送条件请求，304 时复用缓存文件"""
+    monkeypatch.setattr(config, 'IMAGE_REVALIDATE', True)
+    test_url = f"{site.url}/img/1-0"
+    result = generator._download_image(test_url)
+
+    assert generator._download_image(test_url) == result
+    assert len(site.image_requests()) == 2
+    assert site.request_headers[-1].get('If-None-Match') == site.image_etag
+
+def test_fast_image_size(tmp_path):
+    """JPEG、PNG 只解析文件头，其他格式回退到 Pillow，结果与 Pillow 一致"""
+    for filename, image_format in (('a.jpg', 'JPEG'), ('b.png', 'PNG'), ('c.gif', 'GIF')):
+        path = _create_test_image(tmp_path, filename, (321, 123), image_format)
+        assert _fast_image_size(path) == (321, 123)
+
+    progressive_path = os.path.join(str(tmp_path), 'progressive.jpg')
+    PILImage.new('RGB', (200, 100), 'red').save(progressive_path, 'JPEG', progressive=True)
+    assert _fast_image_size(progressive_path) == (200, 100)
+
+def test_fast_image_size_rereads_overwritten_file(tmp_path):
+    """文件被原地覆盖后不返回缓存的旧尺寸"""
+    path = _create_test_image(tmp_path, 'a.jpg', (321, 123))
+    assert _fast_image_size(path) == (321, 123)
+
+    _create_test_image(tmp_path, 'a.jpg', (100, 50))
+    assert _fast_image_size(path) == (100, 50)
+
+def test_prepare_image_regenerates_stale_thumbnail(generator, tmp_path):
+    """原图被覆盖后重新生成缩略图，不再复用旧的缩放结果"""
+    src_path = _create_test_image(tmp_path, 'big.png', (2000, 1000), 'PNG')
+    first = generator._prepare_image(src_path, 1200)
+    assert _fast_image_size(first) == (1200, 600)
+
+    PILImage.new('RGB', (1000, 2000), 'blue').save(src_path, 'PNG')
+    stat = os.stat(src_path)
+    os.utime(src_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    second = generator._prepare_image(src_path, 1200)
+    assert _fast_image_size(second) == (600, 1200)
+
+def test_parallel_pdf_numbers_pages_globally(generator, monkeypatch):
+    """多进程生成的临时页合并后，页码在整个文档中连续，总页数一致"""
+    monkeypatch.setattr(config, 'PDF_PAGE_SIZE', 4)
+    monkeypatch.setattr(config, 'PDF_WORKERS', 2)
+    designs = [{'title': f'T{i}', 'description': 'desc ' * 150, 'type': 'x', 'author': 'a', 'date': '2024'} for i in range(8)]
+
+    result = generator.generate_full_pdf_parallel(designs, "parallel.pdf")
+
+    assert result is not None
+    numbers = _page_numbers(result)
+    total = len(numbers)
+    assert numbers == [(page, total) for page in range(1, total + 1)]
+
+def test_parallel_pdf_can_run_twice(generator, monkeypatch):
+    """合并后临时目录被清理，同一实例再次生成时仍包含封面且页码正确"""
+    monkeypatch.setattr(config, 'PDF_PAGE_SIZE', 4)
+    monkeypatch.setattr(config, 'PDF_WORKERS', 2)
+    designs = [{'title': f'T{i}', 'description': 'desc', 'type': 'x', 'author': 'a', 'date': '2024'} for i in range(8)]
+
+    results = [generator.generate_full_pdf_parallel(designs, name) for name in ("first.pdf", "second.pdf")]
+
+    assert None not in results
+    assert _page_numbers(results[1]) == _page_numbers(results[0])
+    for result in results:
+        numbers = _page_numbers(result)
+        assert numbers == [(page, len(numbers)) for page in range(1, len(numbers) + 1)]
+        assert '共收录 8 个设计作品' in PdfReader(result).pages[0].extract_text()
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([os.path.dirname(os.path.abspath(__file__)), '-q']))
@@ -0,0 +1,154 @@
+import os
+import sys
+import csv
+import hashlib
+
+# 从项目根目录导入被测模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import requests
+
+import reddot_crawler
+from reddot_crawler import RedDotCrawler, _url_key
+
+def _make_crawler(site, output_dir, **kwargs) -> RedDotCrawler:
+    """指向本地模拟网站的爬虫，使用普通 Session，不读写 HTTP 缓存"""
+    return RedDotCrawler(
+        base_url=f"{site.url}/api",
+        output_dir=str(output_dir),
+        site_base_url=site.url,
+        session=requests.Session(),
+        **kwargs
+    )
+
+@pytest.fixture
+def crawler(site, tmp_path):
+    crawler = _make_crawler(site, tmp_path)
+    yield crawler
+    crawler.close()
+    crawler.session.close()
+
+def test_url_key():
+    """URL 摘要是稳定的 64 位整数，不同 URL 的摘要不同"""
+    key = _url_key('/de/project/a')
+    assert key == _url_key('/de/project/a')
+    assert 0 <= key < 2 ** 64
+    assert key != _url_key('/de/project/b')
+
+def test_search_stops_at_num_found(crawler, site):
+    """收到 numFound 条结果后停止翻页，不再请求返回空页的下一页"""
+    designs = crawler.search_designs(category_name='test')
+
+    assert [d['title'] for d in designs] == [f'T{page}-{i}' for page in (1, 2) for i in range(3)]
+    assert all(d['author'] == 'Alice, Bob' and d['description'] == 'Desc text' for d in designs)
+    assert all(d['image_path'] and os.path.exists(d['image_path']) for d in designs)
+    assert site.api_pages() == [1, 2]
+
+    with open(os.path.join(crawler.output_dir, 'reddot_designs_test.csv'), encoding='utf-8-sig') as f:
+        assert len(list(csv.DictReader(f))) == 6
+
+def test_search_without_num_found_stops_on_empty_page(crawler, site):
+    """API 不返回 numFound 时，遇到空页才停止（空页之后至多还有一个已在进行中的预取请求）"""
+    site.num_found = False
+
+    assert len(crawler.search_designs(category_name='test')) == 6
+    assert site.api_pages() in ([1, 2, 3], [1, 2, 3, 4])
+
+def test_details_are_cached_across_runs(site, tmp_path):
+    """详情页解析结果缓存到磁盘，重新运行时不再请求详情页"""
+    detail_url = f"{site.url}/detail/1-0"
+    first = _make_crawler(site, tmp_path)
+    details = first.get_design_details(detail_url)
+    first.close()
+
+    second = _make_crawler(site, tmp_path)
+    assert second.get_design_details(detail_url) == details
+    second.close()
+    assert len(site.detail_requests()) == 1
+
+@pytest.mark.parametrize('content_type, extension', [
+    ('image/jpeg', '.jpg'),
+    ('image/png; charset=binary', '.png'),
+    ('IMAGE/WEBP', '.webp'),
+    ('image/avif', '.avif'),
+])
+def test_download_image_extension(crawler, site, content_type, extension):
+    """文件后缀按 Content-Type 查表，忽略参数和大小写，表中没有的类型使用子类型"""
+    path = crawler.download_image(f"{site.url}/img/x?ct={content_type}", crawler.images_dir)
+
+    assert path is not None and path.endswith(extension)
+
+def test_download_image_rejects_non_image(crawler, site):
+    assert crawler.download_image(f"{site.url}/img/x?ct=text/html", crawler.images_dir) is None
+
+def test_download_image_reuses_file_without_request(crawler, site):
+    """已下载的图片直接复用，不再发送请求"""
+    url = f"{site.url}/img/1-0"
+    path = crawler.download_image(url, crawler.images_dir)
+
+    assert crawler.download_image(url, crawler.images_dir) == path
+    assert len(site.image_requests()) == 1
+
+def test_download_image_reuses_file_without_sidecar(crawler, site):
+    """没有 .meta.json 的已下载图片同样直接复用，并补写 .meta.json"""
+    url = f"{site.url}/img/1-0"
+    url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+    path = os.path.join(crawler.images_dir, url_hash + '.png')
+    with open(path, 'wb') as f:
+        f.write(site.image)
+
+    assert crawler.download_image(url, crawler.images_dir) == path
+    assert os.path.exists(os.path.join(crawler.images_dir, url_hash + '.meta.json'))
+    assert site.image_requests() == []
+
+def test_download_image_ignores_truncated_sidecar(crawler, site):
+    """截断的 .meta.json 不会让该图片永远下载失败"""
+    url = f"{site.url}/img/1-0"
+    path = crawler.download_image(url, crawler.images_dir)
+    with open(os.path.splitext(path)[0] + '.meta.json', 'w', encoding='utf-8') as f:
+        f.write('{"file": "ab')
+
+    assert crawler.download_image(url, crawler.images_dir) == path
+
+@pytest.mark.parametrize('with_sidecar', [False, True])
+def test_download_image_migrates_md5_names(crawler, site, with_sidecar):
+    """旧版本以 URL 的 md5 命名的图片（有无 .meta.json）链接到新文件名，不重新下载"""
+    url = f"{site.url}/img/1-0"
+    legacy_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+    legacy_path = os.path.join(crawler.images_dir, legacy_hash + '.jpg')
+    with open(legacy_path, 'wb') as f:
+        f.write(site.image)
+    if with_sidecar:
+        reddot_crawler._save_image_meta(os.path.join(crawler.images_dir, legacy_hash + '.meta.json'),
+                                        {'file': legacy_hash + '.jpg', 'etag': '"v1"', 'last_modified': None})
+
+    path = crawler.download_image(url, crawler.images_dir)
+
+    assert path is not None and os.path.basename(path).startswith(hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest())
+    assert os.path.samefile(path, legacy_path)
+    assert site.image_requests() == []
+
+def test_shared_images_dir_across_categories(site, tmp_path):
+    """多个分类共用图片目录和摘要表：同一 URL 只下载一次，内容相同的图片保存为硬链接；沿用旧的分类图片目录"""
+    images_dir = str(tmp_path / 'images')
+    image_digests = {}
+    # 旧版本保存在分类目录中的图片
+    legacy_url = f"{site.url}/img/legacy"
+    legacy_dir = tmp_path / 'b' / 'images'
+    legacy_dir.mkdir(parents=True)
+    (legacy_dir / (hashlib.md5(legacy_url.encode('utf-8')).hexdigest() + '.jpg')).write_bytes(site.image)
+
+    first = _make_crawler(site, tmp_path / 'a', images_dir=images_dir, image_digests=image_digests)
+    path_a = first.download_image(f"{site.url}/img/a", images_dir)
+    first.close()
+
+    second = _make_crawler(site, tmp_path / 'b', images_dir=images_dir, image_digests=image_digests)
+    assert second.download_image(f"{site.url}/img/a", images_dir) == path_a
+    path_b = second.download_image(f"{site.url}/img/b", images_dir)
+    path_legacy = second.download_image(legacy_url, images_dir)
+    second.close()
+
+    assert os.path.samefile(path_a, path_b)
+    assert os.path.dirname(path_legacy) == images_dir
+    assert site.image_requests() == ['/img/a', '/img/b']